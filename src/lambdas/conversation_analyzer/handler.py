@@ -5,89 +5,106 @@ Conversation Analyzer Lambda Function
 定期的に実行され、リアクションが多い会話やキーワードを抽出してデータベースに保存します。
 """
 
+import heapq
 import json
+import logging
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from collections import Counter
-import re
 
 # 共通モジュールをインポート
 from shared.slack_client import SlackClient
 from shared.database import DynamoDBClient
 from shared.models import Conversation
+from shared.text_analysis import extract_keywords, analyze_sentiment
 
 
-def extract_keywords(text: str, min_length: int = 2) -> list:
-    """テキストからキーワードを抽出
+# ログレベルは環境変数で切り替え（DEBUGでイベント全体を出力）
+logger = logging.getLogger()
+_log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
+# 不正な値でも起動に失敗しないようINFOにフォールバックする
+logger.setLevel(_log_level if _log_level in logging.getLevelNamesMapping() else logging.INFO)
+
+
+# リアクション取得の並列数とレート制限（Slack Tier 2 を想定）
+REACTION_FETCH_WORKERS = 16
+REACTION_FETCH_RPS = 10
+
+# 分析対象チャンネル（環境変数から取得）
+CHANNEL_IDS = [c.strip() for c in os.environ.get('SLACK_CHANNEL_IDS', 'C01234567').split(',')]
+
+# 分析期間（日数）
+ANALYSIS_DAYS = int(os.environ.get('ANALYSIS_DAYS', '7'))
+
+# 同時に分析するチャンネル数の上限
+MAX_CHANNEL_WORKERS = 8
+
+# 1チャンネルあたりの走査上限と、分析対象とするメッセージ数
+HISTORY_SCAN_LIMIT = 1000
+ANALYSIS_TOP_N = 200
+
+
+class _RateLimiter:
+    """スレッド間で共有する簡易レートリミッター"""
+    
+    def __init__(self, rate_per_sec: float):
+        self._interval = 1.0 / rate_per_sec
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+    
+    def wait(self):
+        """次の呼び出しが許可されるまで待機"""
+        with self._lock:
+            now = time.monotonic()
+            wait_for = self._next_at - now
+            self._next_at = max(now, self._next_at) + self._interval
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+
+# レート制限とスレッドプールは全チャンネルのワーカーで共有する
+# （Slackのレート制限はワークスペース単位のため、チャンネルごとに作ると上限を超える）
+_reaction_limiter = _RateLimiter(REACTION_FETCH_RPS)
+_reaction_executor = ThreadPoolExecutor(max_workers=REACTION_FETCH_WORKERS)
+
+
+def fetch_reactions_parallel(slack: SlackClient, channel_id: str, messages: list) -> list:
+    """複数メッセージのリアクションを並列に取得
     
     Args:
-        text: テキスト
-        min_length: 最小文字数
+        slack: SlackClient
+        channel_id: チャンネルID
+        messages: メッセージリスト
         
     Returns:
-        list: キーワードリスト
+        list: messagesと同じ順序のリアクションリスト
     """
-    # 技術用語パターン
-    tech_patterns = [
-        r'\b[A-Z][a-z]+(?:[A-Z][a-z]+)+\b',  # CamelCase (e.g., JavaScript, TypeScript)
-        r'\b[A-Z]{2,}\b',  # 大文字略語 (e.g., API, AWS, CI/CD)
-        r'\w+(?:\.js|\.py|\.go|\.rb)\b',  # ファイル拡張子付き
-    ]
-    
-    keywords = []
-    
-    # 技術用語を抽出
-    for pattern in tech_patterns:
-        matches = re.findall(pattern, text)
-        keywords.extend(matches)
+    def fetch(message):
+        _reaction_limiter.wait()
+        return slack.get_reactions(channel_id, message.get('ts'))
     
-    # 日本語のキーワード抽出（簡易版）
-    # TODO: 形態素解析ライブラリ（MeCab等）を使用して精度向上
-    japanese_words = re.findall(r'[ぁ-んァ-ヶー一-龠]+', text)
-    keywords.extend([w for w in japanese_words if len(w) >= min_length])
-    
-    # 英単語の抽出
-    english_words = re.findall(r'\b[a-zA-Z]{3,}\b', text)
-    keywords.extend(english_words)
-    
-    # 重複を除去して返す
-    return list(set(keywords))
+    return list(_reaction_executor.map(fetch, messages))
 
 
-def analyze_sentiment(text: str, reaction_count: int) -> str:
-    """感情分析（簡易版）
+def group_reactions(reactions: list) -> list:
+    """get_reactionsの結果をconversations.historyと同じ形式にまとめる
     
     Args:
-        text: テキスト
-        reaction_count: リアクション数
+        reactions: [{'user_id': 'U123', 'reaction': 'thumbsup'}, ...]
         
     Returns:
-        str: 'positive', 'neutral', 'negative'
+        list: [{'name': 'thumbsup', 'count': 1, 'users': ['U123']}, ...]
     """
-    # ポジティブなキーワード
-    positive_keywords = ['良い', '素晴らしい', '最高', 'いいね', '面白い', 'すごい', 'ありがとう', '成功', '解決']
-    
-    # ネガティブなキーワード
-    negative_keywords = ['悪い', '問題', 'エラー', 'バグ', '失敗', '困った', '難しい']
-    
-    text_lower = text.lower()
-    
-    positive_count = sum(1 for kw in positive_keywords if kw in text_lower)
-    negative_count = sum(1 for kw in negative_keywords if kw in text_lower)
-    
-    # リアクション数も考慮
-    if reaction_count >= 5:
-        positive_count += 2
-    elif reaction_count >= 3:
-        positive_count += 1
-    
-    if positive_count > negative_count:
-        return 'positive'
-    elif negative_count > positive_count:
-        return 'negative'
-    else:
-        return 'neutral'
+    grouped = {}
+    for r in reactions:
+        entry = grouped.setdefault(r['reaction'], {'name': r['reaction'], 'count': 0, 'users': []})
+        entry['count'] += 1
+        entry['users'].append(r['user_id'])
+    return list(grouped.values())
 
 
 def analyze_channel_history(
@@ -111,19 +128,22 @@ def analyze_channel_history(
         # 対象期間を計算
         oldest_ts = (datetime.now() - timedelta(days=days)).timestamp()
         
-        # チャンネル履歴を取得
-        messages = slack.get_channel_history(
-            channel=channel_id,  # ✅ 'channel_id' → 'channel' に変更
-            oldest=str(oldest_ts),
-            limit=1000
-        )
-        
-        print(f"Retrieved {len(messages)} messages from channel {channel_id}")
-        
         analyzed_conversations = []
-        all_keywords = []
+        pending_conversations = []
+        keyword_counter = Counter()
         
-        for message in messages:
+        # チャンネル履歴をページ単位で読みながら、
+        # リアクション数の多い上位N件だけをヒープに保持する
+        top_messages = []
+        scanned = 0
+        for message in slack.iter_channel_history(
+            channel=channel_id,  # ✅ 'channel_id' → 'channel' に変更
+            oldest=str(oldest_ts)
+        ):
+            scanned += 1
+            if scanned > HISTORY_SCAN_LIMIT:
+                break
+            
             # Bot メッセージは除外
             if message.get('bot_id') or message.get('subtype'):
                 continue
@@ -132,10 +152,39 @@ def analyze_channel_history(
             if not text or len(text) < 10:
                 continue
             
+            # リアクションが2件未満のメッセージはこの時点で除外
+            inline_count = sum(r.get('count', 0) for r in message.get('reactions', []))
+            if inline_count < 2:
+                continue
+            
+            entry = (inline_count, scanned, message)
+            if len(top_messages) < ANALYSIS_TOP_N:
+                heapq.heappush(top_messages, entry)
+            elif inline_count > top_messages[0][0]:
+                heapq.heapreplace(top_messages, entry)
+        
+        logger.info("Retrieved %s messages from channel %s", min(scanned, HISTORY_SCAN_LIMIT), channel_id)
+        
+        # 分析対象のメッセージ（リアクション数の多い順）
+        candidates = [message for _, _, message in sorted(top_messages, reverse=True)]
+        
+        # リアクションはconversations.historyの結果に含まれているものを使う
+        # usersが欠けているメッセージのみ reactions.get で取得し直す
+        incomplete = [
+            m for m in candidates
+            if any('users' not in r for r in m.get('reactions', []))
+        ]
+        fetched = fetch_reactions_parallel(slack, channel_id, incomplete)
+        refetched_reactions = {
+            m.get('ts'): group_reactions(reactions)
+            for m, reactions in zip(incomplete, fetched)
+        }
+        
+        for message in candidates:
+            text = message.get('text', '')
             message_ts = message.get('ts')
             
-            # リアクションを取得
-            reactions = slack.get_reactions(channel_id, message_ts)
+            reactions = refetched_reactions.get(message_ts, message.get('reactions', []))
             reaction_count = sum(r.get('count', 0) for r in reactions)
             
             # リアクションが2件以上のメッセージのみ分析
@@ -144,7 +193,7 @@ def analyze_channel_history(
             
             # キーワード抽出
             keywords = extract_keywords(text)
-            all_keywords.extend(keywords)
+            keyword_counter.update(keywords)
             
             # 参加者（リアクションしたユーザー）を取得
             participants = []
@@ -167,8 +216,8 @@ def analyze_channel_history(
                 is_used_for_topic=False
             )
             
-            # データベースに保存
-            db.put_conversation(conversation.to_dict())
+            # ループ後にまとめて保存する
+            pending_conversations.append(conversation.to_dict())
             
             analyzed_conversations.append({
                 'conversation_id': conversation.conversation_id,
@@ -177,12 +226,14 @@ def analyze_channel_history(
                 'sentiment': sentiment
             })
         
+        # データベースにまとめて保存（BatchWriteItem）
+        db.batch_put_conversations(pending_conversations)
+        
         # キーワードの頻度を集計
-        keyword_counter = Counter(all_keywords)
         top_keywords = keyword_counter.most_common(20)
         
-        print(f"Analyzed {len(analyzed_conversations)} conversations")
-        print(f"Top keywords: {top_keywords[:10]}")
+        logger.info("Analyzed %s conversations", len(analyzed_conversations))
+        logger.info("Top keywords: %s", top_keywords[:10])
         
         return {
             'success': True,
@@ -192,9 +243,7 @@ def analyze_channel_history(
         }
     
     except Exception as e:
-        print(f"Error analyzing channel history: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error analyzing channel history")
         return {'success': False, 'error': str(e)}
 
 
@@ -210,36 +259,29 @@ def lambda_handler(event, context):
     Returns:
         dict: 実行結果
     """
-    print(f"Conversation analyzer triggered: {json.dumps(event)}")
+    logger.debug("Conversation analyzer triggered: %s", event)
     
     try:
-        # クライアント初期化
+        # クライアント初期化（DynamoDBClientのresourceはスレッドごとに共有される）
         slack = SlackClient()
-        db = DynamoDBClient()
-        
-        # 分析対象チャンネル（環境変数から取得）
-        channel_ids = os.environ.get('SLACK_CHANNEL_IDS', 'C01234567').split(',')
-        
-        # 分析期間（日数）
-        analysis_days = int(os.environ.get('ANALYSIS_DAYS', '7'))
-        
-        results = []
         
-        for channel_id in channel_ids:
-            channel_id = channel_id.strip()
-            print(f"Analyzing channel: {channel_id}")
-            
-            result = analyze_channel_history(
+        def analyze(channel_id):
+            logger.info("Analyzing channel: %s", channel_id)
+            return analyze_channel_history(
                 slack=slack,
-                db=db,
+                db=DynamoDBClient(),
                 channel_id=channel_id,
-                days=analysis_days
+                days=ANALYSIS_DAYS
             )
-            
-            results.append({
-                'channel_id': channel_id,
-                'result': result
-            })
+        
+        # チャンネルごとの分析は独立しているため並列に実行
+        with ThreadPoolExecutor(max_workers=min(MAX_CHANNEL_WORKERS, len(CHANNEL_IDS))) as executor:
+            channel_results = list(executor.map(analyze, CHANNEL_IDS))
+        
+        results = [
+            {'channel_id': channel_id, 'result': result}
+            for channel_id, result in zip(CHANNEL_IDS, channel_results)
+        ]
         
         return {
             'statusCode': 200,
@@ -250,9 +292,7 @@ def lambda_handler(event, context):
         }
     
     except Exception as e:
-        print(f"Error in lambda_handler: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in lambda_handler")
         
         return {
             'statusCode': 500,
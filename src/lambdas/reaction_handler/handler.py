@@ -6,14 +6,17 @@ API GatewayまたはSlack EventsAPIからトリガーされます。
 """
 
 import json
+import logging
 import os
+import re
 import sys
 from datetime import datetime, timedelta
 
 # 共通モジュールをインポート
-from shared.slack_client import SlackClient
+from shared import secret_store
+from shared.slack_client import SlackClient, SLACK_SECRET_NAME
 from shared.block_builder import BlockBuilder
-from shared.calendar_client import CalendarClient
+from shared.calendar_client import CalendarClient, GOOGLE_SECRET_NAME
 from shared.calendar_utils import (
     parse_japanese_datetime,
     format_datetime_japanese,
@@ -24,6 +27,60 @@ from shared.database import DynamoDBClient
 from shared.models import EventTracking
 
 
+# ログレベルは環境変数で切り替え（DEBUGでイベント全体を出力）
+logger = logging.getLogger()
+_log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
+# 不正な値でも起動に失敗しないようINFOにフォールバックする
+logger.setLevel(_log_level if _log_level in logging.getLevelNamesMapping() else logging.INFO)
+
+
+# 日時を含む可能性がある行かどうかの簡易判定
+_DATETIME_HINT_RE = re.compile(r'[\d月時]')
+
+
+# ミーティング提案のリアクション閾値
+MEETING_PROPOSAL_THRESHOLD = int(os.environ.get('MEETING_PROPOSAL_THRESHOLD', '3'))
+
+# イベントを作成するカレンダー
+CALENDAR_ID = os.environ.get('CALENDAR_ID', 'primary')
+
+# ウォームスタート時に再利用するクライアント（初回利用時に生成）
+_slack = None
+_db = None
+_calendar = None
+
+
+def _bootstrap_secrets() -> None:
+    """Slack・Googleの認証情報を1回のAPI呼び出しでまとめて取得"""
+    secret_store.prefetch_secrets([SLACK_SECRET_NAME, GOOGLE_SECRET_NAME])
+
+
+def get_slack_client() -> SlackClient:
+    """SlackClientを取得（コンテナ内で使い回す）"""
+    global _slack
+    if _slack is None:
+        _bootstrap_secrets()
+        _slack = SlackClient()
+    return _slack
+
+
+def get_db_client() -> DynamoDBClient:
+    """DynamoDBClientを取得（コンテナ内で使い回す）"""
+    global _db
+    if _db is None:
+        _db = DynamoDBClient()
+    return _db
+
+
+def get_calendar_client() -> CalendarClient:
+    """CalendarClientを取得（コンテナ内で使い回す）"""
+    global _calendar
+    if _calendar is None:
+        _bootstrap_secrets()
+        _calendar = CalendarClient(calendar_id=CALENDAR_ID)
+    return _calendar
+
+
 def handle_reaction_added(event_data: dict, slack: SlackClient, db: DynamoDBClient) -> dict:
     """リアクション追加イベントを処理
     
@@ -46,43 +103,37 @@ def handle_reaction_added(event_data: dict, slack: SlackClient, db: DynamoDBClie
         if not all([reaction, user_id, channel_id, message_ts]):
             return {'success': False, 'error': 'Missing required fields'}
         
-        print(f"Reaction added: {reaction} by {user_id} on {channel_id}/{message_ts}")
+        logger.info("Reaction added: reaction=%s user=%s channel=%s ts=%s", reaction, user_id, channel_id, message_ts)
         
         # 対象メッセージに対応するEventTrackingを取得
         event_tracking = db.get_event_by_message(message_ts, channel_id)
         
         if not event_tracking:
-            print("No event tracking found for this message")
+            logger.info("No event tracking found for this message")
             return {'success': True, 'action': 'ignored', 'reason': 'not tracked'}
         
-        # ユーザー情報を取得
-        user_info = slack.get_user_info(user_id)
-        user_email = user_info.get('email', '')
-        
-        # リアクションを追加
-        db.add_reaction_to_event(
+        # リアクションを追加（更新後のevent_trackingが返る）
+        # メールアドレスはミーティング作成時にまとめて取得する
+        event_tracking = db.add_reaction_to_event(
             event_tracking_id=event_tracking['event_tracking_id'],
             user_id=user_id,
-            user_email=user_email,
             reaction=reaction
         )
         
-        # 更新後のevent_trackingを取得
-        event_tracking = db.get_event(event_tracking['event_tracking_id'])
+        if not event_tracking:
+            return {'success': False, 'error': 'Failed to add reaction'}
         
         # リアクション数をカウント
-        reactions = event_tracking.get('reactions', [])
-        unique_users = set(r['user_id'] for r in reactions)
-        reaction_count = len(unique_users)
+        reaction_count = int(event_tracking.get('reaction_user_count', 0))
         
-        print(f"Total unique reactions: {reaction_count}")
+        logger.info("Total unique reactions: %s", reaction_count)
         
         # 閾値チェック（3人以上のリアクション）
-        threshold = int(os.environ.get('MEETING_PROPOSAL_THRESHOLD', '3'))
+        threshold = MEETING_PROPOSAL_THRESHOLD
         
         if reaction_count >= threshold and event_tracking.get('status') == 'collecting_reactions':
             # ミーティング提案を投稿
-            print(f"Threshold reached ({reaction_count} >= {threshold}), posting meeting proposal")
+            logger.info("Threshold reached (%s >= %s), posting meeting proposal", reaction_count, threshold)
             
             blocks = BlockBuilder.meeting_proposal(participant_count=reaction_count)
             
@@ -113,9 +164,7 @@ def handle_reaction_added(event_data: dict, slack: SlackClient, db: DynamoDBClie
         }
     
     except Exception as e:
-        print(f"Error handling reaction: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error handling reaction")
         return {'success': False, 'error': str(e)}
 
 
@@ -129,9 +178,16 @@ def extract_datetime_from_message(text: str):
         tuple: (parsed_datetime, confidence)
     """
     # 複数の日時パターンを試す
+    # 数字などを含まない行はパースを試さない
+    if not _DATETIME_HINT_RE.search(text):
+        return (None, 'low')
+    
     lines = text.split('\n')
     for line in lines:
-        dt = parse_japanese_datetime(line.strip())
+        line = line.strip()
+        if not _DATETIME_HINT_RE.search(line):
+            continue
+        dt = parse_japanese_datetime(line)
         if dt:
             return (dt, 'high')
     
@@ -157,7 +213,7 @@ def extract_duration_from_message(text: str) -> int:
 
 
 def handle_schedule_request(
-    event_tracking_id: str,
+    event_tracking: dict,
     channel_id: str,
     thread_ts: str,
     user_id: str,
@@ -169,7 +225,7 @@ def handle_schedule_request(
     """スケジュール作成リクエストを処理
     
     Args:
-        event_tracking_id: イベントトラッキングID
+        event_tracking: 取得済みのEventTrackingデータ
         channel_id: チャンネルID
         thread_ts: スレッドTS
         user_id: リクエストユーザーID
@@ -182,11 +238,7 @@ def handle_schedule_request(
         dict: 処理結果
     """
     try:
-        # EventTrackingを取得
-        event_tracking = db.get_event(event_tracking_id)
-        
-        if not event_tracking:
-            return {'success': False, 'error': 'Event not found'}
+        event_tracking_id = event_tracking['event_tracking_id']
         
         # 状態によって処理を分岐
         status = event_tracking.get('status')
@@ -216,9 +268,10 @@ def handle_schedule_request(
             else:
                 event_title = 'チームミーティング'
             
-            # 参加者を取得
+            # 参加者を取得（メールアドレスはここでまとめて解決する）
             reactions = event_tracking.get('reactions', [])
-            attendee_emails = list(set(r['user_email'] for r in reactions if r.get('user_email')))
+            users_info = slack.get_users_info_batch({r['user_id'] for r in reactions})
+            attendee_emails = list({u['email'] for u in users_info.values() if u.get('email')})
             
             if not attendee_emails:
                 slack.post_message(
@@ -275,9 +328,7 @@ def handle_schedule_request(
         return {'success': True, 'action': 'no_action'}
     
     except Exception as e:
-        print(f"Error handling schedule request: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error handling schedule request")
         
         # エラーをSlackに通知
         error_blocks = BlockBuilder.error_message(
@@ -326,7 +377,7 @@ def handle_message_event(event_data: dict, slack: SlackClient, db: DynamoDBClien
         if event_tracking and event_tracking.get('status') == 'scheduling':
             # スケジュール作成処理
             result = handle_schedule_request(
-                event_tracking_id=event_tracking['event_tracking_id'],
+                event_tracking=event_tracking,
                 channel_id=channel_id,
                 thread_ts=thread_ts,
                 user_id=user_id,
@@ -340,9 +391,7 @@ def handle_message_event(event_data: dict, slack: SlackClient, db: DynamoDBClien
         return {'success': True, 'action': 'ignored', 'reason': 'not_scheduling'}
     
     except Exception as e:
-        print(f"Error handling message event: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error handling message event")
         return {'success': False, 'error': str(e)}
 
 
@@ -359,12 +408,15 @@ def lambda_handler(event, context):
     Returns:
         dict: レスポンス
     """
-    print(f"Received event: {json.dumps(event)}")
+    logger.debug("Received event: %s", event)
     
     try:
         # API Gateway経由の場合、bodyをパース
-        if 'body' in event:
-            body = json.loads(event['body']) if isinstance(event['body'], str) else event['body']
+        raw_body = event.get('body')
+        if isinstance(raw_body, str):
+            body = json.loads(raw_body)
+        elif 'body' in event:
+            body = raw_body
         else:
             body = event
         
@@ -382,8 +434,8 @@ def lambda_handler(event, context):
             
             if event_type == 'reaction_added':
                 # クライアント初期化
-                slack = SlackClient()
-                db = DynamoDBClient()
+                slack = get_slack_client()
+                db = get_db_client()
                 
                 # リアクション処理
                 result = handle_reaction_added(event_data, slack, db)
@@ -395,10 +447,9 @@ def lambda_handler(event, context):
             
             elif event_type == 'message':
                 # クライアント初期化
-                slack = SlackClient()
-                db = DynamoDBClient()
-                calendar = CalendarClient(calendar_id=os.environ.get('CALENDAR_ID', 'primary'))
-
+                slack = get_slack_client()
+                db = get_db_client()
+                calendar = get_calendar_client()
                 
                 # メッセージ処理
                 result = handle_message_event(event_data, slack, db, calendar)
@@ -409,7 +460,7 @@ def lambda_handler(event, context):
                 }
             
             else:
-                print(f"Unhandled event type: {event_type}")
+                logger.info("Unhandled event type: %s", event_type)
                 return {
                     'statusCode': 200,
                     'body': json.dumps({'message': 'Event type not handled'})
@@ -421,9 +472,7 @@ def lambda_handler(event, context):
         }
     
     except Exception as e:
-        print(f"Error in lambda_handler: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in lambda_handler")
         
         return {
             'statusCode': 500,
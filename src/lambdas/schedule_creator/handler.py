@@ -6,14 +6,17 @@ Schedule Creator Lambda Function
 """
 
 import json
+import logging
 import os
+import re
 import sys
 from datetime import datetime, timedelta
 
 # 共通モジュールをインポート
-from shared.slack_client import SlackClient
+from shared import secret_store
+from shared.slack_client import SlackClient, SLACK_SECRET_NAME
 from shared.block_builder import BlockBuilder
-from shared.calendar_client import CalendarClient
+from shared.calendar_client import CalendarClient, GOOGLE_SECRET_NAME
 from shared.calendar_utils import (
     parse_japanese_datetime,
     format_datetime_japanese,
@@ -24,6 +27,46 @@ from shared.database import DynamoDBClient
 from shared.models import EventTracking
 
 
+# ログレベルは環境変数で切り替え（DEBUGでイベント全体を出力）
+logger = logging.getLogger()
+_log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
+# 不正な値でも起動に失敗しないようINFOにフォールバックする
+logger.setLevel(_log_level if _log_level in logging.getLevelNamesMapping() else logging.INFO)
+
+
+# 日時を含む可能性がある行かどうかの簡易判定
+_DATETIME_HINT_RE = re.compile(r'[\d月時]')
+
+
+# ウォームスタート時に再利用するクライアント（初回利用時に生成）
+_slack = None
+_db = None
+_calendar = None
+
+
+def _bootstrap_secrets() -> None:
+    """Slack・Googleの認証情報を1回のAPI呼び出しでまとめて取得"""
+    secret_store.prefetch_secrets([SLACK_SECRET_NAME, GOOGLE_SECRET_NAME])
+
+
+def get_clients() -> tuple:
+    """各クライアントを取得（コンテナ内で使い回す）
+    
+    Returns:
+        tuple: (SlackClient, DynamoDBClient, CalendarClient)
+    """
+    global _slack, _db, _calendar
+    if _slack is None or _calendar is None:
+        _bootstrap_secrets()
+    if _slack is None:
+        _slack = SlackClient()
+    if _db is None:
+        _db = DynamoDBClient()
+    if _calendar is None:
+        _calendar = CalendarClient()
+    return _slack, _db, _calendar
+
+
 def extract_datetime_from_message(text: str):
     """メッセージから日時情報を抽出
     
@@ -34,9 +77,16 @@ def extract_datetime_from_message(text: str):
         tuple: (parsed_datetime, confidence)
     """
     # 複数の日時パターンを試す
+    # 数字などを含まない行はパースを試さない
+    if not _DATETIME_HINT_RE.search(text):
+        return (None, 'low')
+    
     lines = text.split('\n')
     for line in lines:
-        dt = parse_japanese_datetime(line.strip())
+        line = line.strip()
+        if not _DATETIME_HINT_RE.search(line):
+            continue
+        dt = parse_japanese_datetime(line)
         if dt:
             return (dt, 'high')
     
@@ -62,7 +112,7 @@ def extract_duration_from_message(text: str) -> int:
 
 
 def handle_schedule_request(
-    event_tracking_id: str,
+    event_tracking: dict,
     channel_id: str,
     thread_ts: str,
     user_id: str,
@@ -74,7 +124,7 @@ def handle_schedule_request(
     """スケジュール作成リクエストを処理
     
     Args:
-        event_tracking_id: イベントトラッキングID
+        event_tracking: 取得済みのEventTrackingデータ
         channel_id: チャンネルID
         thread_ts: スレッドTS
         user_id: リクエストユーザーID
@@ -87,11 +137,7 @@ def handle_schedule_request(
         dict: 処理結果
     """
     try:
-        # EventTrackingを取得
-        event_tracking = db.get_event(event_tracking_id)
-        
-        if not event_tracking:
-            return {'success': False, 'error': 'Event not found'}
+        event_tracking_id = event_tracking['event_tracking_id']
         
         # 状態によって処理を分岐
         status = event_tracking.get('status')
@@ -121,9 +167,10 @@ def handle_schedule_request(
             else:
                 event_title = 'チームミーティング'
             
-            # 参加者を取得
+            # 参加者を取得（メールアドレスはここでまとめて解決する）
             reactions = event_tracking.get('reactions', [])
-            attendee_emails = list(set(r['user_email'] for r in reactions if r.get('user_email')))
+            users_info = slack.get_users_info_batch({r['user_id'] for r in reactions})
+            attendee_emails = list({u['email'] for u in users_info.values() if u.get('email')})
             
             if not attendee_emails:
                 slack.post_message(
@@ -180,9 +227,7 @@ def handle_schedule_request(
         return {'success': True, 'action': 'no_action'}
     
     except Exception as e:
-        print(f"Error handling schedule request: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error handling schedule request")
         
         # エラーをSlackに通知
         error_blocks = BlockBuilder.error_message(
@@ -212,7 +257,7 @@ def lambda_handler(event, context):
     Returns:
         dict: レスポンス
     """
-    print(f"Received event: {json.dumps(event)}")
+    logger.debug("Received event: %s", event)
     
     try:
         # API Gateway経由の場合、bodyをパース
@@ -241,9 +286,7 @@ def lambda_handler(event, context):
                     return {'statusCode': 200, 'body': json.dumps({'message': 'Bot message ignored'})}
                 
                 # クライアント初期化
-                slack = SlackClient()
-                db = DynamoDBClient()
-                calendar = CalendarClient()
+                slack, db, calendar = get_clients()
                 
                 # スレッドの元メッセージに対応するEventTrackingを取得
                 event_tracking = db.get_event_by_message(thread_ts, channel_id)
@@ -251,7 +294,7 @@ def lambda_handler(event, context):
                 if event_tracking and event_tracking.get('status') == 'scheduling':
                     # スケジュール作成処理
                     result = handle_schedule_request(
-                        event_tracking_id=event_tracking['event_tracking_id'],
+                        event_tracking=event_tracking,
                         channel_id=channel_id,
                         thread_ts=thread_ts,
                         user_id=user_id,
@@ -272,9 +315,7 @@ def lambda_handler(event, context):
         }
     
     except Exception as e:
-        print(f"Error in lambda_handler: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in lambda_handler")
         
         return {
             'statusCode': 500,
@@ -5,18 +5,48 @@ Scheduled Poster Lambda Function
 EventBridgeからトリガーされ、ランダムな話題または過去の会話から生成した話題をSlackに投稿します。
 """
 
+import heapq
 import json
+import logging
 import os
 import sys
 import random
-from datetime import datetime, timedelta
 import uuid
 
 # 共通モジュールをインポート
 from shared.slack_client import SlackClient
 from shared.block_builder import BlockBuilder
 from shared.database import DynamoDBClient
-from shared.models import Topic, EventTracking
+from shared.models import Topic, EventTracking, _now_iso
+
+
+# ログレベルは環境変数で切り替え（DEBUGでイベント全体を出力）
+logger = logging.getLogger()
+_log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
+# 不正な値でも起動に失敗しないようINFOにフォールバックする
+logger.setLevel(_log_level if _log_level in logging.getLevelNamesMapping() else logging.INFO)
+
+
+# 投稿先チャンネル（環境変数から取得、デフォルトは#random）
+SLACK_CHANNEL_ID = os.environ.get('SLACK_CHANNEL_ID', 'C01234567')  # 実際のチャンネルIDに変更
+
+# ウォームスタート時に再利用するクライアント（初回利用時に生成）
+_slack = None
+_db = None
+
+
+def get_clients() -> tuple:
+    """各クライアントを取得（コンテナ内で使い回す）
+    
+    Returns:
+        tuple: (SlackClient, DynamoDBClient)
+    """
+    global _slack, _db
+    if _slack is None:
+        _slack = SlackClient()
+    if _db is None:
+        _db = DynamoDBClient()
+    return _slack, _db
 
 
 def load_topics() -> dict:
@@ -26,23 +56,23 @@ def load_topics() -> dict:
         return json.load(f)
 
 
+# 話題マスターデータはモジュール読み込み時に一度だけロードする
+_TOPICS = load_topics()
+_CASUAL_TOPICS = tuple(_TOPICS['casual_topics'])
+_TECHNICAL_TOPICS = tuple(_TOPICS['technical_topics'])
+
+
 def select_random_topic(db: DynamoDBClient) -> tuple:
     """ランダムに話題を選択
     
     Returns:
         tuple: (category, topic_content, reaction_emoji, topic_id)
     """
-    # マスターデータをロード
-    topics_data = load_topics()
-    
     # カテゴリをランダムに選択（雑談40%, 技術40%, 過去の会話20%）
     # この関数ではランダム話題のみ扱う（雑談 or 技術）
     category = random.choice(['casual', 'technical'])
     
-    if category == 'casual':
-        topic_list = topics_data['casual_topics']
-    else:
-        topic_list = topics_data['technical_topics']
+    topic_list = _CASUAL_TOPICS if category == 'casual' else _TECHNICAL_TOPICS
     
     # ランダムに話題を選択
     topic = random.choice(topic_list)
@@ -81,24 +111,26 @@ def select_question_target(slack: SlackClient, db: DynamoDBClient) -> tuple:
             return (None, None)
         
         # 最近質問されていないユーザーを優先
-        # 各ユーザーの最近の質問回数をチェック
-        user_scores = []
-        for user in active_users:
-            recent_questions = db.get_recent_questions_for_user(user['id'], days=7)
-            score = len(recent_questions)  # 少ないほど優先
-            user_scores.append((user, score))
-        
-        # スコアでソート（質問回数が少ない順）
-        user_scores.sort(key=lambda x: x[1])
-        
-        # 上位3名からランダムに選択（バリエーションのため）
-        top_candidates = user_scores[:min(3, len(user_scores))]
+        # 全ユーザーの最近の質問回数を一括で取得
+        question_counts = db.get_question_counts_since(days=7)
+        if question_counts is None:
+            # 一括集計に失敗した場合はユーザーごとに数える（未集計のユーザーを0回扱いしない）
+            question_counts = {
+                u['id']: len(db.get_recent_questions_for_user(u['id'], days=7, attributes=['question_id']))
+                for u in active_users
+            }
+        
+        # スコアを付ける（少ないほど優先）
+        user_scores = [(u, question_counts.get(u['id'], 0)) for u in active_users]
+        
+        # 質問回数が少ない上位3名からランダムに選択（バリエーションのため）
+        top_candidates = heapq.nsmallest(3, user_scores, key=lambda x: x[1])
         selected_user, _ = random.choice(top_candidates)
         
         return (selected_user['id'], selected_user.get('real_name', selected_user.get('name', 'メンバー')))
     
-    except Exception as e:
-        print(f"Error selecting question target: {e}")
+    except Exception:
+        logger.exception("Error selecting question target")
         return (None, None)
 
 
@@ -131,15 +163,14 @@ def post_random_topic(slack: SlackClient, db: DynamoDBClient, channel_id: str) -
         
         message_ts = response['ts']
         
-        # Topicデータを保存
+        # Topicデータを作成
         topic = Topic(
             topic_id=topic_id,
             category=category,
             content=content,
             reaction_emoji=reaction_emoji,
-            last_used_at=datetime.utcnow().isoformat()
+            last_used_at=_now_iso()
         )
-        db.put_topic(topic.to_dict())
         
         # EventTrackingを作成
         event_tracking = EventTracking(
@@ -150,9 +181,11 @@ def post_random_topic(slack: SlackClient, db: DynamoDBClient, channel_id: str) -
             event_title=None,
             status='collecting_reactions'
         )
-        db.put_event(event_tracking.to_dict())
         
-        print(f"Posted topic: {topic_id} ({category})")
+        # TopicとEventTrackingを1回のトランザクションで保存
+        db.put_topic_and_event(topic.to_dict(), event_tracking.to_dict())
+        
+        logger.info("Posted topic: %s (%s)", topic_id, category)
         return {
             'success': True,
             'message_ts': message_ts,
@@ -161,9 +194,7 @@ def post_random_topic(slack: SlackClient, db: DynamoDBClient, channel_id: str) -
         }
     
     except Exception as e:
-        print(f"Error posting random topic: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error posting random topic")
         return {'success': False, 'error': str(e)}
 
 
@@ -178,7 +209,7 @@ def post_question_to_member(slack: SlackClient, db: DynamoDBClient, channel_id:
         user_id, user_name = select_question_target(slack, db)
         
         if not user_id:
-            print("No suitable user found for question")
+            logger.info("No suitable user found for question")
             return {'success': False, 'error': 'No user found'}
         
         # 質問文を生成
@@ -224,17 +255,16 @@ def post_question_to_member(slack: SlackClient, db: DynamoDBClient, channel_id:
         
         message_ts = response['ts']
         
-        # Questionデータを保存
+        # Questionデータを作成
         from shared.models import Question
         question = Question(
             question_id=Question.generate_id(),
             user_id=user_id,
-            asked_at=datetime.utcnow().isoformat(),
+            asked_at=_now_iso(),
             question_content=question_content,
             channel_id=channel_id,
             message_ts=message_ts
         )
-        db.put_question(question.to_dict())
         
         # EventTrackingも作成
         event_tracking = EventTracking(
@@ -245,9 +275,11 @@ def post_question_to_member(slack: SlackClient, db: DynamoDBClient, channel_id:
             event_title=None,
             status='collecting_reactions'
         )
-        db.put_event(event_tracking.to_dict())
         
-        print(f"Posted question to user: {user_id}")
+        # QuestionとEventTrackingを1回のトランザクションで保存
+        db.put_question_and_event(question.to_dict(), event_tracking.to_dict())
+        
+        logger.info("Posted question to user: %s", user_id)
         return {
             'success': True,
             'message_ts': message_ts,
@@ -256,9 +288,7 @@ def post_question_to_member(slack: SlackClient, db: DynamoDBClient, channel_id:
         }
     
     except Exception as e:
-        print(f"Error posting question: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error posting question")
         return {'success': False, 'error': str(e)}
 
 
@@ -272,21 +302,16 @@ def lambda_handler(event, context):
     Returns:
         dict: 実行結果
     """
-    print(f"Scheduled poster triggered: {json.dumps(event)}")
+    logger.debug("Scheduled poster triggered: %s", event)
     
     try:
         # クライアント初期化
-        slack = SlackClient()
-        db = DynamoDBClient()
+        slack, db = get_clients()
         
-        # 投稿先チャンネル（環境変数から取得、デフォルトは#random）
-        channel_id = os.environ.get('SLACK_CHANNEL_ID', 'C01234567')  # 実際のチャンネルIDに変更
+        channel_id = SLACK_CHANNEL_ID
         
         # 投稿タイプを決定（80%: ランダム話題, 20%: メンバーへの質問）
-        post_type = random.choices(
-            ['random_topic', 'member_question'],
-            weights=[0.8, 0.2]
-        )[0]
+        post_type = 'random_topic' if random.random() < 0.8 else 'member_question'
         
         if post_type == 'random_topic':
             result = post_random_topic(slack, db, channel_id)
@@ -299,9 +324,7 @@ def lambda_handler(event, context):
         }
     
     except Exception as e:
-        print(f"Error in lambda_handler: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in lambda_handler")
         
         return {
             'statusCode': 500,
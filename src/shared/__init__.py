@@ -7,6 +7,8 @@ from .block_builder import BlockBuilder
 from .calendar_client import CalendarClient
 from .database import DynamoDBClient, decimal_to_python
 from . import calendar_utils
+from . import secret_store
+from . import text_analysis
 from . import models
 
 __all__ = [
@@ -16,5 +18,7 @@ __all__ = [
     'DynamoDBClient',
     'decimal_to_python',
     'calendar_utils',
+    'secret_store',
+    'text_analysis',
     'models'
 ]
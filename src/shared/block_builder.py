@@ -5,6 +5,7 @@ Slack Block Kitを使ったメッセージUIを簡単に作成するための
 ヘルパークラスを提供します。
 """
 
+import functools
 from typing import List, Dict, Optional
 
 
@@ -67,20 +68,27 @@ class BlockBuilder:
         Returns:
             List[Dict]: Block Kitのブロック配列
         """
+        # キャッシュするのは不変な文字列のみ。ブロックは呼び出しごとに新しく組み立てる
         return [
             {
                 "type": "section",
                 "text": {
                     "type": "mrkdwn",
-                    "text": (
-                        f"🎉 この話題、盛り上がってますね！（{participant_count}名が興味あり）\n"
-                        f"もっと詳しく話したい方はいますか？\n"
-                        f"ミーティングを設定する場合は :calendar: でリアクションしてください！"
-                    )
+                    "text": BlockBuilder._meeting_proposal_text(participant_count)
                 }
             }
         ]
     
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _meeting_proposal_text(participant_count: int) -> str:
+        """meeting_proposalの本文（参加者数ごとにキャッシュ）"""
+        return (
+            f"🎉 この話題、盛り上がってますね！（{participant_count}名が興味あり）\n"
+            f"もっと詳しく話したい方はいますか？\n"
+            f"ミーティングを設定する場合は :calendar: でリアクションしてください！"
+        )
+    
     @staticmethod
     def schedule_poll(options: List[Dict[str, str]]) -> List[Dict]:
         """日程投票用のブロック
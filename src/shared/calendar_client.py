@@ -7,13 +7,56 @@ Google Calendar APIとの通信を行うクライアントクラスを提供し
 
 import os
 import json
-import boto3
+import time
+import uuid
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Union
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from . import secret_store
+
+
+# サービスアカウント認証情報のシークレット名
+GOOGLE_SECRET_NAME = os.environ.get('GOOGLE_SECRET_NAME', 'google-calendar/credentials')
+
+# 認証情報のキャッシュ（ウォームスタートのLambdaコンテナ内で共有）
+CREDENTIALS_CACHE_TTL = 600  # 10分
+_credentials_cache: Dict[str, tuple] = {}  # {secret_name: (取得時刻, Credentials)}
+_service_cache: Optional[tuple] = None  # (Credentials, Resource)
+
+# Google Calendar APIのバッチリクエスト1回あたりの上限件数
+BATCH_MAX_REQUESTS = 50
+
+# FreeBusyクエリ1回あたりのカレンダー数の上限
+FREEBUSY_MAX_ITEMS = 50
+
+
+def _build_service(credentials: service_account.Credentials):
+    """Calendar APIサービスを構築（同じ認証情報なら使い回す）
+    
+    ディスカバリードキュメントはネットワークから取得せずライブラリ同梱のものを使い、
+    そのパースを伴うサービス構築もコンテナ内で1回に抑えます。
+    
+    Args:
+        credentials: サービスアカウント認証情報
+    
+    Returns:
+        googleapiclient.discovery.Resource: Calendar APIサービス
+    """
+    global _service_cache
+    if _service_cache is None or _service_cache[0] is not credentials:
+        service = build(
+            'calendar', 'v3',
+            credentials=credentials,
+            cache_discovery=False,
+            static_discovery=True
+        )
+        _service_cache = (credentials, service)
+    return _service_cache[1]
+
 
 class CalendarClient:
     """Google Calendar APIクライアント"""
@@ -30,7 +73,7 @@ class CalendarClient:
             calendar_id: カレンダーID（Noneの場合はprimary）
         """
         self.credentials = self._get_credentials()
-        self.service = build('calendar', 'v3', credentials=self.credentials)
+        self.service = _build_service(self.credentials)
         self.calendar_id = calendar_id or 'primary'
     
     def _get_credentials(self) -> service_account.Credentials:
@@ -42,26 +85,26 @@ class CalendarClient:
         Raises:
             Exception: 認証情報取得失敗時
         """
-        secret_name = os.environ.get('GOOGLE_SECRET_NAME', 'google-calendar/credentials')
-        region = os.environ.get('AWS_REGION', 'ap-northeast-1')
+        secret_name = GOOGLE_SECRET_NAME
         
-        session = boto3.session.Session()
-        client = session.client('secretsmanager', region_name=region)
+        cached = _credentials_cache.get(secret_name)
+        if cached and time.monotonic() - cached[0] < CREDENTIALS_CACHE_TTL:
+            return cached[1]
         
         try:
-            response = client.get_secret_value(SecretId=secret_name)
-            service_account_info = json.loads(response['SecretString'])
+            service_account_info = secret_store.get_secret(secret_name)
             
             credentials = service_account.Credentials.from_service_account_info(
                 service_account_info,
                 scopes=self.SCOPES
             )
+            _credentials_cache[secret_name] = (time.monotonic(), credentials)
             return credentials
         except Exception as e:
             raise Exception(f"Failed to get Google credentials: {str(e)}")
     
-    def create_event(
-        self,
+    @staticmethod
+    def _build_event_body(
         summary: str,
         start_time: datetime,
         end_time: datetime,
@@ -70,33 +113,14 @@ class CalendarClient:
         attendees: Optional[List[str]] = None,
         timezone: str = "Asia/Tokyo"
     ) -> Dict:
-        """カレンダーイベントを作成
+        """events().insertに渡すイベント本体を組み立てる
         
         Args:
-            summary: イベント名
-            start_time: 開始時刻（timezone-aware datetime推奨）
-            end_time: 終了時刻（timezone-aware datetime推奨）
-            description: 説明
-            location: 場所/URL
-            attendees: 参加者のメールアドレスリスト
-            timezone: タイムゾーン（デフォルト: Asia/Tokyo）
+            create_eventと同じ
         
         Returns:
-            Dict: 作成されたイベント情報
-                {
-                    'id': イベントID,
-                    'html_link': カレンダーURL,
-                    'summary': イベント名,
-                    'start': 開始時刻,
-                    'end': 終了時刻,
-                    'meet_link': Google Meetのリンク
-                }
-                
-        Raises:
-            Exception: イベント作成失敗時
+            Dict: Google Calendar APIのイベントリソース
         """
-        import uuid
-        
         event = {
             'summary': summary,
             'location': location,
@@ -134,6 +158,78 @@ class CalendarClient:
             event['guestsCanInviteOthers'] = False
             event['guestsCanSeeOtherGuests'] = True
         
+        return event
+    
+    @staticmethod
+    def _format_created_event(created_event: Dict) -> Dict:
+        """作成レスポンスを呼び出し元向けの辞書に変換
+        
+        Args:
+            created_event: events().insertのレスポンス
+        
+        Returns:
+            Dict: create_eventと同じ形式のイベント情報
+        """
+        # 作成レスポンスからMeetリンクを取得
+        meet_link = None
+        if 'hangoutLink' in created_event:
+            meet_link = created_event['hangoutLink']
+        elif 'conferenceData' in created_event:
+            entry_points = created_event['conferenceData'].get('entryPoints', [])
+            for entry_point in entry_points:
+                if entry_point.get('entryPointType') == 'video':
+                    meet_link = entry_point.get('uri')
+                    break
+        
+        return {
+            'id': created_event['id'],
+            'html_link': created_event.get('htmlLink', ''),
+            'summary': created_event.get('summary', ''),
+            'start': created_event['start'].get('dateTime', ''),
+            'end': created_event['end'].get('dateTime', ''),
+            'meet_link': meet_link,
+            'attendees': [a.get('email', '') for a in created_event.get('attendees', [])]
+        }
+    
+    def create_event(
+        self,
+        summary: str,
+        start_time: datetime,
+        end_time: datetime,
+        description: str = "",
+        location: str = "",
+        attendees: Optional[List[str]] = None,
+        timezone: str = "Asia/Tokyo"
+    ) -> Dict:
+        """カレンダーイベントを作成
+        
+        Args:
+            summary: イベント名
+            start_time: 開始時刻（timezone-aware datetime推奨）
+            end_time: 終了時刻（timezone-aware datetime推奨）
+            description: 説明
+            location: 場所/URL
+            attendees: 参加者のメールアドレスリスト
+            timezone: タイムゾーン（デフォルト: Asia/Tokyo）
+        
+        Returns:
+            Dict: 作成されたイベント情報
+                {
+                    'id': イベントID,
+                    'html_link': カレンダーURL,
+                    'summary': イベント名,
+                    'start': 開始時刻,
+                    'end': 終了時刻,
+                    'meet_link': Google Meetのリンク
+                }
+                
+        Raises:
+            Exception: イベント作成失敗時
+        """
+        event = self._build_event_body(
+            summary, start_time, end_time, description, location, attendees, timezone
+        )
+        
         try:
             # サービスアカウントは招待メールを送れないため、sendUpdates='none'にする
             # ただし、参加者はイベントに追加されるため、カレンダーで確認可能
@@ -148,31 +244,7 @@ class CalendarClient:
             # デバッグ: レスポンスから参加者情報を確認
             print(f"Created event attendees: {created_event.get('attendees', [])}")
             
-            # 作成レスポンスからMeetリンクを取得
-            meet_link = None
-            if 'hangoutLink' in created_event:
-                meet_link = created_event['hangoutLink']
-            elif 'conferenceData' in created_event:
-                entry_points = created_event['conferenceData'].get('entryPoints', [])
-                for entry_point in entry_points:
-                    if entry_point.get('entryPointType') == 'video':
-                        meet_link = entry_point.get('uri')
-                        break
-            
-            # 参加者情報を取得
-            attendee_list = []
-            if 'attendees' in created_event:
-                attendee_list = [a.get('email', '') for a in created_event['attendees']]
-            
-            return {
-                'id': created_event['id'],
-                'html_link': created_event.get('htmlLink', ''),
-                'summary': created_event.get('summary', ''),
-                'start': created_event['start'].get('dateTime', ''),
-                'end': created_event['end'].get('dateTime', ''),
-                'meet_link': meet_link,
-                'attendees': attendee_list
-            }
+            return self._format_created_event(created_event)
         except HttpError as error:
             # エラー詳細をログ出力
             print(f"Error creating event: {error}")
@@ -196,31 +268,15 @@ class CalendarClient:
                 print(f"Fallback - Request event body: {json.dumps(event, indent=2, ensure_ascii=False)}")
                 print(f"Fallback - Response created_event: {json.dumps(created_event, indent=2, ensure_ascii=False, default=str)}")
                 
-                # Meetリンクを取得
-                meet_link = None
-                if 'hangoutLink' in created_event:
-                    meet_link = created_event['hangoutLink']
-                elif 'conferenceData' in created_event:
-                    entry_points = created_event['conferenceData'].get('entryPoints', [])
-                    for entry_point in entry_points:
-                        if entry_point.get('entryPointType') == 'video':
-                            meet_link = entry_point.get('uri')
-                            break
+                result = self._format_created_event(created_event)
+                result['attendees'] = []
                 
                 # デバッグ: フォールバック処理後のMeetリンク確認
-                print(f"Fallback - Meet link: {meet_link}")
+                print(f"Fallback - Meet link: {result['meet_link']}")
                 print(f"Fallback - conferenceData in response: {'conferenceData' in created_event}")
                 print(f"Fallback - hangoutLink in response: {'hangoutLink' in created_event}")
                 
-                return {
-                    'id': created_event['id'],
-                    'html_link': created_event.get('htmlLink', ''),
-                    'summary': created_event.get('summary', ''),
-                    'start': created_event['start'].get('dateTime', ''),
-                    'end': created_event['end'].get('dateTime', ''),
-                    'meet_link': meet_link,
-                    'attendees': []
-                }
+                return result
             raise Exception(f"Failed to create event: {error}")
     
     def update_event(
@@ -258,41 +314,42 @@ class CalendarClient:
             Exception: イベント更新失敗時
         """
         try:
-            # 既存イベントを取得
-            event = self.service.events().get(
-                calendarId=self.calendar_id,
-                eventId=event_id
-            ).execute()
-            
-            # 更新するフィールドを適用
+            # 変更するフィールドだけをpatchで送信する
+            event = {}
             if summary:
                 event['summary'] = summary
             if start_time:
-                event['start']['dateTime'] = start_time.isoformat()
+                event['start'] = {'dateTime': start_time.isoformat()}
             if end_time:
-                event['end']['dateTime'] = end_time.isoformat()
+                event['end'] = {'dateTime': end_time.isoformat()}
             if description is not None:
                 event['description'] = description
             if location is not None:
                 event['location'] = location
             
-            # 参加者の追加・削除
+            # 参加者の追加・削除（既存の参加者リストが必要な場合のみ取得）
             if add_attendees or remove_attendees:
-                attendees = event.get('attendees', [])
+                current = self.service.events().get(
+                    calendarId=self.calendar_id,
+                    eventId=event_id,
+                    fields='attendees'
+                ).execute()
+                attendees = current.get('attendees', [])
                 attendee_emails = {a['email'] for a in attendees}
+                remove_set = set(remove_attendees or ())
                 
-                if add_attendees:
-                    for email in add_attendees:
-                        if email and email not in attendee_emails:
-                            attendees.append({'email': email})
-                
-                if remove_attendees:
-                    attendees = [a for a in attendees if a['email'] not in remove_attendees]
+                # 削除対象を除き、未登録のメールアドレスだけを追加（入力順を維持）
+                attendees = [a for a in attendees if a['email'] not in remove_set]
+                attendees.extend(
+                    {'email': email}
+                    for email in dict.fromkeys(add_attendees or ())
+                    if email and email not in attendee_emails and email not in remove_set
+                )
                 
                 event['attendees'] = attendees
             
             # イベントを更新
-            updated_event = self.service.events().update(
+            updated_event = self.service.events().patch(
                 calendarId=self.calendar_id,
                 eventId=event_id,
                 body=event,
@@ -325,6 +382,133 @@ class CalendarClient:
         except HttpError as error:
             raise Exception(f"Failed to delete event: {error}")
     
+    def _execute_batch(self, requests: Iterable, label: str) -> List:
+        """HttpRequestをバッチリクエストにまとめて実行
+        
+        BATCH_MAX_REQUESTS件ごとに1回のHTTP呼び出し（multipart/mixed）で送信します。
+        
+        Args:
+            requests: 実行するHttpRequestのイテラブル
+            label: エラーログ用の操作名
+        
+        Returns:
+            List: 入力と同じ順序のレスポンス
+                失敗した要素には発生した例外（HttpError）がそのまま入るため、
+                呼び出し側でステータスコードを見て再試行やエラー通知を判断できます
+        """
+        results = []
+        requests = iter(requests)
+        
+        def callback(request_id, response, exception):
+            if exception is not None:
+                print(f"Error in batch {label} (#{request_id}): {exception}")
+                results[int(request_id)] = exception
+                return
+            results[int(request_id)] = response
+        
+        while True:
+            chunk = list(islice(requests, BATCH_MAX_REQUESTS))
+            if not chunk:
+                break
+            batch = self.service.new_batch_http_request(callback=callback)
+            for request in chunk:
+                batch.add(request, request_id=str(len(results)))
+                results.append(None)
+            batch.execute()
+        
+        return results
+    
+    def create_events_batch(self, events: List[Dict]) -> List[Union[Dict, HttpError]]:
+        """複数のイベントをバッチリクエストで作成
+        
+        Args:
+            events: create_eventの引数を持つ辞書のリスト
+                [{'summary': ..., 'start_time': ..., 'end_time': ..., ...}, ...]
+        
+        Returns:
+            List[Union[Dict, HttpError]]: 入力と同じ順序のイベント情報
+                （create_eventと同じ形式、失敗した要素はHttpError）
+        """
+        requests = (
+            self.service.events().insert(
+                calendarId=self.calendar_id,
+                body=self._build_event_body(**event),
+                sendUpdates='none',
+                conferenceDataVersion=1
+            )
+            for event in events
+        )
+        return [
+            created if isinstance(created, Exception) else self._format_created_event(created)
+            for created in self._execute_batch(requests, 'create')
+        ]
+    
+    def update_events_batch(self, updates: List[Dict]) -> List[Union[Dict, HttpError]]:
+        """複数のイベントをバッチリクエストで更新
+        
+        既存イベントを取得せずにpatchで変更フィールドのみを送信します。
+        参加者の追加・削除は既存の参加者リストが必要なためupdate_eventを使用してください。
+        
+        Args:
+            updates: 'event_id'と更新フィールド（summary, start_time, end_time,
+                description, location）を持つ辞書のリスト
+        
+        Returns:
+            List[Union[Dict, HttpError]]: 入力と同じ順序の更新結果（失敗した要素はHttpError）
+        """
+        requests = []
+        for update in updates:
+            body = {}
+            if update.get('summary'):
+                body['summary'] = update['summary']
+            if update.get('start_time'):
+                body['start'] = {'dateTime': update['start_time'].isoformat()}
+            if update.get('end_time'):
+                body['end'] = {'dateTime': update['end_time'].isoformat()}
+            if update.get('description') is not None:
+                body['description'] = update['description']
+            if update.get('location') is not None:
+                body['location'] = update['location']
+            
+            requests.append(self.service.events().patch(
+                calendarId=self.calendar_id,
+                eventId=update['event_id'],
+                body=body,
+                sendUpdates='all'
+            ))
+        
+        return [
+            updated if isinstance(updated, Exception) else {
+                'id': updated['id'],
+                'html_link': updated.get('htmlLink', ''),
+                'summary': updated.get('summary', '')
+            }
+            for updated in self._execute_batch(requests, 'update')
+        ]
+    
+    def delete_events_batch(self, event_ids: List[str]) -> List[Optional[HttpError]]:
+        """複数のイベントをバッチリクエストで削除
+        
+        Args:
+            event_ids: 削除するイベントIDのリスト
+        
+        Returns:
+            List[Optional[HttpError]]: 入力と同じ順序の削除エラー（成功時はNone）
+        """
+        requests = (
+            self.service.events().delete(
+                calendarId=self.calendar_id,
+                eventId=event_id,
+                sendUpdates='all'
+            )
+            for event_id in event_ids
+        )
+        # 削除成功時のレスポンスは空のため、エラーの要素だけを残す
+        return [
+            response if isinstance(response, Exception) else None
+            for response in self._execute_batch(requests, 'delete')
+        ]
+    
     def get_event(self, event_id: str) -> Dict:
         """イベント情報を取得
         
@@ -389,17 +573,31 @@ class CalendarClient:
             Exception: 空き時間チェック失敗時
         """
         try:
-            body = {
-                "timeMin": start_time.isoformat() + 'Z',
-                "timeMax": end_time.isoformat() + 'Z',
-                "items": [{"id": email} for email in emails]
-            }
+            # FreeBusyは1リクエストあたりのカレンダー数に上限があるため分割し、
+            # 複数に分かれた場合はバッチリクエストで1回のHTTP呼び出しにまとめる
+            requests = [
+                self.service.freebusy().query(body={
+                    "timeMin": start_time.isoformat() + 'Z',
+                    "timeMax": end_time.isoformat() + 'Z',
+                    "items": [{"id": email} for email in emails[i:i + FREEBUSY_MAX_ITEMS]]
+                })
+                for i in range(0, len(emails), FREEBUSY_MAX_ITEMS)
+            ]
+            
+            if len(requests) == 1:
+                results = [requests[0].execute()]
+            else:
+                results = self._execute_batch(requests, 'freebusy')
             
-            result = self.service.freebusy().query(body=body).execute()
+            calendars = {}
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+                calendars.update(result['calendars'])
             
             availability = {}
             for email in emails:
-                calendar = result['calendars'].get(email, {})
+                calendar = calendars.get(email, {})
                 busy_slots = calendar.get('busy', [])
                 # busyスロットが空ならavailable
                 availability[email] = len(busy_slots) == 0
@@ -7,8 +7,34 @@ Calendar Utility Functions
 
 from datetime import datetime, timedelta
 from typing import Optional
+from zoneinfo import ZoneInfo
 import re
-import pytz
+
+
+JST = ZoneInfo('Asia/Tokyo')
+
+# 曜日表記（datetime.weekday()のインデックス順）
+WEEKDAYS = ('月', '火', '水', '木', '金', '土', '日')
+
+# 日時パターン（モジュール読み込み時に一度だけコンパイル）
+# "12/5 14:00", "2025/12/05 14:00", 秒付きの形式
+_SLASH_DATETIME_RE = re.compile(r'(?:(\d{4})/)?(\d{1,2})/(\d{1,2})\s+(\d{1,2}):(\d{1,2})(?::(\d{1,2}))?')
+# "2025-12-05 14:00", "12-05 14:00"
+_DASH_DATETIME_RE = re.compile(r'(?:(\d{4})-)?(\d{1,2})-(\d{1,2})\s+(\d{1,2}):(\d{1,2})')
+# "12月5日 14時", "12月5日 14時00分", "12月5日 14:00", "2025年12月5日 14:00"
+_JP_DATETIME_RE = re.compile(r'(?:(\d+)年)?(\d+)月(\d+)日\s+(\d+)(?:時(?:(\d+)分)?|:(\d+))')
+
+# 所要時間パターン: "1時間30分", "90分", "1.5時間"
+_DURATION_RE = re.compile(r'(?:(\d+)時間(?:(\d+)分)?|(\d+)分|(\d+\.\d*)時間)')
+
+
+def _localize(year, month, day, hour, minute, second=None) -> Optional[datetime]:
+    """数値文字列からJSTのdatetimeを生成（不正な日付ならNone）"""
+    try:
+        dt = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second or 0))
+    except ValueError:
+        return None
+    return dt.replace(tzinfo=JST)
 
 
 def parse_japanese_datetime(date_str: str) -> Optional[datetime]:
@@ -34,84 +60,18 @@ def parse_japanese_datetime(date_str: str) -> Optional[datetime]:
         return None
     
     date_str = date_str.strip()
-    jst = pytz.timezone('Asia/Tokyo')
     current_year = datetime.now().year
     
-    # パターン1: "12/5 14:00"
-    try:
-        dt = datetime.strptime(date_str, "%m/%d %H:%M")
-        dt = dt.replace(year=current_year)
-        return jst.localize(dt)
-    except ValueError:
-        pass
-    
-    # パターン2: "2025/12/05 14:00"
-    try:
-        dt = datetime.strptime(date_str, "%Y/%m/%d %H:%M")
-        return jst.localize(dt)
-    except ValueError:
-        pass
-    
-    # パターン3: "12/5 14:00:00" (秒付き)
-    try:
-        dt = datetime.strptime(date_str, "%m/%d %H:%M:%S")
-        dt = dt.replace(year=current_year)
-        return jst.localize(dt)
-    except ValueError:
-        pass
-    
-    # パターン4: "2025/12/05 14:00:00" (秒付き)
-    try:
-        dt = datetime.strptime(date_str, "%Y/%m/%d %H:%M:%S")
-        return jst.localize(dt)
-    except ValueError:
-        pass
-    
-    # パターン5: "12月5日 14時" または "12月5日 14時00分"
-    match = re.match(r'(\d+)月(\d+)日\s+(\d+)時(?:(\d+)分)?', date_str)
+    # 正規表現で数値を直接取り出し、strptimeや例外による分岐を避ける
+    match = _SLASH_DATETIME_RE.fullmatch(date_str) or _DASH_DATETIME_RE.fullmatch(date_str)
     if match:
-        month, day, hour, minute = match.groups()
-        minute = minute or '0'
-        try:
-            dt = datetime(current_year, int(month), int(day), int(hour), int(minute))
-            return jst.localize(dt)
-        except ValueError:
-            pass
+        year, month, day, hour, minute, *second = match.groups()
+        return _localize(year or current_year, month, day, hour, minute, *second)
     
-    # パターン6: "12月5日 14:00"
-    match = re.match(r'(\d+)月(\d+)日\s+(\d+):(\d+)', date_str)
+    match = _JP_DATETIME_RE.match(date_str)
     if match:
-        month, day, hour, minute = match.groups()
-        try:
-            dt = datetime(current_year, int(month), int(day), int(hour), int(minute))
-            return jst.localize(dt)
-        except ValueError:
-            pass
-    
-    # パターン7: "2025年12月5日 14:00"
-    match = re.match(r'(\d+)年(\d+)月(\d+)日\s+(\d+):(\d+)', date_str)
-    if match:
-        year, month, day, hour, minute = match.groups()
-        try:
-            dt = datetime(int(year), int(month), int(day), int(hour), int(minute))
-            return jst.localize(dt)
-        except ValueError:
-            pass
-    
-    # パターン8: "2025-12-05 14:00" (ISO形式的な)
-    try:
-        dt = datetime.strptime(date_str, "%Y-%m-%d %H:%M")
-        return jst.localize(dt)
-    except ValueError:
-        pass
-    
-    # パターン9: "12-05 14:00"
-    try:
-        dt = datetime.strptime(date_str, "%m-%d %H:%M")
-        dt = dt.replace(year=current_year)
-        return jst.localize(dt)
-    except ValueError:
-        pass
+        year, month, day, hour, jp_minute, colon_minute = match.groups()
+        return _localize(year or current_year, month, day, hour, jp_minute or colon_minute or 0)
     
     return None
 
@@ -125,18 +85,18 @@ def format_datetime_japanese(dt: datetime) -> str:
     Returns:
         str: "2025年12月5日(木) 14:00" 形式の文字列
     """
-    jst = pytz.timezone('Asia/Tokyo')
-    
     # timezone-aware datetimeに変換
     if dt.tzinfo is None:
-        dt_jst = jst.localize(dt)
+        dt_jst = dt.replace(tzinfo=JST)
     else:
-        dt_jst = dt.astimezone(jst)
+        dt_jst = dt.astimezone(JST)
     
-    weekdays = ['月', '火', '水', '木', '金', '土', '日']
-    weekday = weekdays[dt_jst.weekday()]
+    weekday = WEEKDAYS[dt_jst.weekday()]
     
-    return dt_jst.strftime(f"%Y年%m月%d日({weekday}) %H:%M")
+    return (
+        f"{dt_jst.year}年{dt_jst.month:02d}月{dt_jst.day:02d}日({weekday}) "
+        f"{dt_jst.hour:02d}:{dt_jst.minute:02d}"
+    )
 
 
 def format_datetime_short(dt: datetime) -> str:
@@ -148,18 +108,15 @@ def format_datetime_short(dt: datetime) -> str:
     Returns:
         str: "12/5 (木) 14:00" 形式の文字列
     """
-    jst = pytz.timezone('Asia/Tokyo')
-    
     # timezone-aware datetimeに変換
     if dt.tzinfo is None:
-        dt_jst = jst.localize(dt)
+        dt_jst = dt.replace(tzinfo=JST)
     else:
-        dt_jst = dt.astimezone(jst)
+        dt_jst = dt.astimezone(JST)
     
-    weekdays = ['月', '火', '水', '木', '金', '土', '日']
-    weekday = weekdays[dt_jst.weekday()]
+    weekday = WEEKDAYS[dt_jst.weekday()]
     
-    return dt_jst.strftime(f"%-m/%-d ({weekday}) %H:%M")
+    return f"{dt_jst.month}/{dt_jst.day} ({weekday}) {dt_jst.hour:02d}:{dt_jst.minute:02d}"
 
 
 def calculate_end_time(start_time: datetime, duration_minutes: int) -> datetime:
@@ -194,27 +151,16 @@ def parse_duration(duration_str: str) -> Optional[int]:
         return None
     
     duration_str = duration_str.strip()
-    total_minutes = 0
-    
-    # パターン1: "1時間30分"
-    match = re.match(r'(\d+)時間(?:(\d+)分)?', duration_str)
-    if match:
-        hours, minutes = match.groups()
-        total_minutes = int(hours) * 60
-        if minutes:
-            total_minutes += int(minutes)
-        return total_minutes
-    
-    # パターン2: "90分"
-    match = re.match(r'(\d+)分', duration_str)
-    if match:
-        return int(match.group(1))
     
-    # パターン3: "1.5時間"
-    match = re.match(r'(\d+\.?\d*)時間', duration_str)
+    # "1時間30分" / "90分" / "1.5時間" を1回のマッチで判定
+    match = _DURATION_RE.match(duration_str)
     if match:
-        hours = float(match.group(1))
-        return int(hours * 60)
+        hours, minutes, only_minutes, float_hours = match.groups()
+        if hours:
+            return int(hours) * 60 + int(minutes or 0)
+        if only_minutes:
+            return int(only_minutes)
+        return int(float(float_hours) * 60)
     
     # パターン4: "90" (数字のみ、分として解釈)
     try:
@@ -235,9 +181,8 @@ def get_next_weekday(base_date: datetime, weekday: int) -> datetime:
     Returns:
         datetime: 次の指定曜日の日付
     """
-    days_ahead = weekday - base_date.weekday()
-    if days_ahead <= 0:  # 今日またはそれ以前
-        days_ahead += 7
+    # 1〜7日後に丸める（今日と同じ曜日なら翌週）
+    days_ahead = (weekday - base_date.weekday() - 1) % 7 + 1
     return base_date + timedelta(days=days_ahead)
 
 
@@ -259,5 +204,4 @@ def get_jst_now() -> datetime:
     Returns:
         datetime: JST（Asia/Tokyo）での現在時刻
     """
-    jst = pytz.timezone('Asia/Tokyo')
-    return datetime.now(jst)
+    return datetime.now(JST)
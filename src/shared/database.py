@@ -5,21 +5,83 @@ DynamoDBへのアクセスを抽象化するモジュール。
 各テーブルへのCRUD操作を提供します。
 """
 
+import logging
 import os
+import threading
 import boto3
-from datetime import datetime
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any
 from decimal import Decimal
 import json
 
+from .models import _now_iso
+
+
+logger = logging.getLogger(__name__)
+
+# 日時はUTC・オフセットなしのISO 8601形式で保存する（現在時刻はmodels._now_iso）
+_UTC = timezone.utc
+_ISO_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'
+
+
+# boto3のresourceとデフォルトセッションはスレッドセーフではないため、
+# スレッドごとにセッションを作り、resourceを1つだけ生成して使い回す
+_thread_local = threading.local()
+
+
+def _get_dynamodb_resource():
+    """DynamoDB resourceを取得（スレッドごとにキャッシュ）"""
+    resource = getattr(_thread_local, 'resource', None)
+    if resource is None:
+        region = os.environ.get('AWS_REGION', 'ap-northeast-1')
+        resource = boto3.session.Session().resource('dynamodb', region_name=region)
+        _thread_local.resource = resource
+        _thread_local.tables = {}
+    return resource
+
+
+def _get_table(name: str):
+    """Tableオブジェクトを取得（スレッドごとにキャッシュ）"""
+    resource = _get_dynamodb_resource()
+    table = _thread_local.tables.get(name)
+    if table is None:
+        table = resource.Table(name)
+        _thread_local.tables[name] = table
+    return table
+
+
+def _projection_kwargs(attributes: Optional[List[str]]) -> Dict:
+    """取得する属性を絞り込むquery/scan用の引数を生成
+    
+    予約語と衝突しないよう、属性名はExpressionAttributeNamesで置き換えます。
+    
+    Args:
+        attributes: 取得する属性名のリスト（Noneなら全属性）
+    
+    Returns:
+        Dict: ProjectionExpressionとExpressionAttributeNames（指定なしなら空）
+    """
+    if not attributes:
+        return {}
+    names = {f'#p{i}': name for i, name in enumerate(attributes)}
+    return {
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names
+    }
+
 
 class DynamoDBClient:
     """DynamoDB操作クライアント"""
     
     def __init__(self):
-        """初期化"""
-        region = os.environ.get('AWS_REGION', 'ap-northeast-1')
-        self.dynamodb = boto3.resource('dynamodb', region_name=region)
+        """初期化
+        
+        resourceとTableはモジュール側でキャッシュされるため、
+        インスタンスを何度生成してもサービスモデルの再読み込みは発生しません。
+        """
+        self.dynamodb = _get_dynamodb_resource()
         
         # テーブル名を環境変数から取得
         self.topics_table_name = os.environ.get('TOPICS_TABLE', 'SlackBotTopics')
@@ -28,10 +90,37 @@ class DynamoDBClient:
         self.questions_table_name = os.environ.get('QUESTIONS_TABLE', 'SlackBotQuestions')
         
         # テーブルオブジェクト
-        self.topics_table = self.dynamodb.Table(self.topics_table_name)
-        self.conversations_table = self.dynamodb.Table(self.conversations_table_name)
-        self.events_table = self.dynamodb.Table(self.events_table_name)
-        self.questions_table = self.dynamodb.Table(self.questions_table_name)
+        self.topics_table = _get_table(self.topics_table_name)
+        self.conversations_table = _get_table(self.conversations_table_name)
+        self.events_table = _get_table(self.events_table_name)
+        self.questions_table = _get_table(self.questions_table_name)
+    
+    def _batch_put(self, table, items: List[Dict], key_name: str, label: str) -> bool:
+        """複数の項目をまとめて保存
+        
+        batch_writerが25件単位のBatchWriteItemに分割し、
+        UnprocessedItemsの再送も行います。同じキーの項目は最後のものだけを書き込みます。
+        
+        Args:
+            table: 書き込み先のTable
+            items: 保存する項目のリスト
+            key_name: パーティションキー名
+            label: エラーログ用の項目名
+            
+        Returns:
+            bool: 成功したらTrue
+        """
+        if not items:
+            return True
+        
+        try:
+            with table.batch_writer(overwrite_by_pkeys=[key_name]) as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+            return True
+        except Exception:
+            logger.exception("Error batch putting %s", label)
+            return False
     
     # === Topics Table ===
     
@@ -47,8 +136,8 @@ class DynamoDBClient:
         try:
             response = self.topics_table.get_item(Key={'topic_id': topic_id})
             return response.get('Item')
-        except Exception as e:
-            print(f"Error getting topic: {e}")
+        except Exception:
+            logger.exception("Error getting topic %s", topic_id)
             return None
     
     def put_topic(self, topic: Dict) -> bool:
@@ -63,20 +152,33 @@ class DynamoDBClient:
         try:
             self.topics_table.put_item(Item=topic)
             return True
-        except Exception as e:
-            print(f"Error putting topic: {e}")
+        except Exception:
+            logger.exception("Error putting topic")
             return False
     
+    def batch_put_topics(self, topics: List[Dict]) -> bool:
+        """話題をまとめて保存
+        
+        Args:
+            topics: 話題データのリスト
+            
+        Returns:
+            bool: 成功したらTrue
+        """
+        return self._batch_put(self.topics_table, topics, 'topic_id', 'topics')
+    
     def scan_topics(
         self,
         category: Optional[str] = None,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        attributes: Optional[List[str]] = None
     ) -> List[Dict]:
         """話題をスキャン
         
         Args:
             category: カテゴリでフィルタ（casual, technical）
             limit: 取得件数上限
+            attributes: 取得する属性名のリスト（Noneなら全属性）
             
         Returns:
             List[Dict]: 話題リスト
@@ -88,7 +190,8 @@ class DynamoDBClient:
                     'IndexName': 'CategoryIndex',
                     'KeyConditionExpression': 'category = :cat',
                     'ExpressionAttributeValues': {':cat': category},
-                    'ScanIndexForward': False  # 降順（新しい順）
+                    'ScanIndexForward': False,  # 降順（新しい順）
+                    **_projection_kwargs(attributes)
                 }
                 if limit:
                     query_kwargs['Limit'] = limit
@@ -96,15 +199,15 @@ class DynamoDBClient:
                 response = self.topics_table.query(**query_kwargs)
                 return response.get('Items', [])
             else:
-                # categoryが指定されていない場合はscan
-                scan_kwargs = {}
+                # categoryが指定されていない場合はscan（必要な属性だけ転送する）
+                scan_kwargs = _projection_kwargs(attributes)
                 if limit:
                     scan_kwargs['Limit'] = limit
                 
                 response = self.topics_table.scan(**scan_kwargs)
                 return response.get('Items', [])
-        except Exception as e:
-            print(f"Error scanning topics: {e}")
+        except Exception:
+            logger.exception("Error scanning topics")
             return []
     
     def update_topic_usage(self, topic_id: str, reaction_count: int) -> bool:
@@ -118,7 +221,7 @@ class DynamoDBClient:
             bool: 成功したらTrue
         """
         try:
-            now = datetime.utcnow().isoformat()
+            now = _now_iso()
             
             self.topics_table.update_item(
                 Key={'topic_id': topic_id},
@@ -131,8 +234,8 @@ class DynamoDBClient:
                 }
             )
             return True
-        except Exception as e:
-            print(f"Error updating topic usage: {e}")
+        except Exception:
+            logger.exception("Error updating topic usage for %s", topic_id)
             return False
     
     # === Conversations Table ===
@@ -149,10 +252,21 @@ class DynamoDBClient:
         try:
             self.conversations_table.put_item(Item=conversation)
             return True
-        except Exception as e:
-            print(f"Error putting conversation: {e}")
+        except Exception:
+            logger.exception("Error putting conversation")
             return False
     
+    def batch_put_conversations(self, conversations: List[Dict]) -> bool:
+        """会話をまとめて保存
+        
+        Args:
+            conversations: 会話データのリスト
+            
+        Returns:
+            bool: 成功したらTrue
+        """
+        return self._batch_put(self.conversations_table, conversations, 'conversation_id', 'conversations')
+    
     def get_conversation(self, conversation_id: str) -> Optional[Dict]:
         """会話を取得
         
@@ -165,36 +279,48 @@ class DynamoDBClient:
         try:
             response = self.conversations_table.get_item(Key={'conversation_id': conversation_id})
             return response.get('Item')
-        except Exception as e:
-            print(f"Error getting conversation: {e}")
+        except Exception:
+            logger.exception("Error getting conversation %s", conversation_id)
             return None
     
     def query_conversations_by_channel(
         self,
         channel_id: str,
-        limit: int = 50
+        limit: int = 50,
+        attributes: Optional[List[str]] = None
     ) -> List[Dict]:
         """チャンネルIDで会話を検索
         
         Args:
             channel_id: チャンネルID
             limit: 取得件数上限
+            attributes: 取得する属性名のリスト（Noneなら全属性）
             
         Returns:
             List[Dict]: 会話リスト
         """
+        items: List[Dict] = []
         try:
-            response = self.conversations_table.query(
-                IndexName='ChannelTimeIndex',
-                KeyConditionExpression='channel_id = :channel',
-                ExpressionAttributeValues={':channel': channel_id},
-                Limit=limit,
-                ScanIndexForward=False  # 降順（新しい順）
-            )
-            return response.get('Items', [])
-        except Exception as e:
-            print(f"Error querying conversations: {e}")
-            return []
+            query_kwargs = {
+                'IndexName': 'ChannelTimeIndex',
+                'KeyConditionExpression': 'channel_id = :channel',
+                'ExpressionAttributeValues': {':channel': channel_id},
+                'ScanIndexForward': False,  # 降順（新しい順）
+                **_projection_kwargs(attributes)
+            }
+            # 1MBを超えて途中で切られた場合は続きを取得する
+            while len(items) < limit:
+                query_kwargs['Limit'] = limit - len(items)
+                response = self.conversations_table.query(**query_kwargs)
+                items.extend(response.get('Items', []))
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    break
+                query_kwargs['ExclusiveStartKey'] = last_key
+            return items
+        except Exception:
+            logger.exception("Error querying conversations")
+            return items
     
     # === Events Table ===
     
@@ -210,10 +336,21 @@ class DynamoDBClient:
         try:
             self.events_table.put_item(Item=event)
             return True
-        except Exception as e:
-            print(f"Error putting event: {e}")
+        except Exception:
+            logger.exception("Error putting event")
             return False
     
+    def batch_put_events(self, events: List[Dict]) -> bool:
+        """イベントをまとめて保存
+        
+        Args:
+            events: イベントデータのリスト
+            
+        Returns:
+            bool: 成功したらTrue
+        """
+        return self._batch_put(self.events_table, events, 'event_tracking_id', 'events')
+    
     def get_event(self, event_tracking_id: str) -> Optional[Dict]:
         """イベントを取得
         
@@ -226,8 +363,8 @@ class DynamoDBClient:
         try:
             response = self.events_table.get_item(Key={'event_tracking_id': event_tracking_id})
             return response.get('Item')
-        except Exception as e:
-            print(f"Error getting event: {e}")
+        except Exception:
+            logger.exception("Error getting event %s", event_tracking_id)
             return None
     
     def get_event_by_message(self, slack_message_ts: str, channel_id: str) -> Optional[Dict]:
@@ -241,12 +378,11 @@ class DynamoDBClient:
             Optional[Dict]: イベントデータ
         """
         try:
-            # MessageIndexはslack_message_tsのみをHASHキーとして持つ
-            # channel_idはFilterExpressionでフィルタリング
+            # ChannelMessageIndex（channel_id + slack_message_ts）で1件だけ引く
+            # FilterExpressionを使わないため、Limit=1でも取りこぼしがない
             response = self.events_table.query(
-                IndexName='MessageIndex',
-                KeyConditionExpression='slack_message_ts = :ts',
-                FilterExpression='channel_id = :channel',
+                IndexName='ChannelMessageIndex',
+                KeyConditionExpression='channel_id = :channel AND slack_message_ts = :ts',
                 ExpressionAttributeValues={
                     ':ts': slack_message_ts,
                     ':channel': channel_id
@@ -255,8 +391,8 @@ class DynamoDBClient:
             )
             items = response.get('Items', [])
             return items[0] if items else None
-        except Exception as e:
-            print(f"Error getting event by message: {e}")
+        except Exception:
+            logger.exception("Error getting event by message")
             return None
     
     def update_event_status(
@@ -276,68 +412,228 @@ class DynamoDBClient:
             bool: 成功したらTrue
         """
         try:
-            now = datetime.utcnow().isoformat()
-            
-            update_expr = 'SET #status = :status, updated_at = :now'
-            expr_attr_names = {'#status': 'status'}
-            expr_attr_values = {':status': status, ':now': now}
+            now = _now_iso()
             
-            for key, value in kwargs.items():
-                update_expr += f', {key} = :{key}'
-                expr_attr_values[f':{key}'] = value
+            update_expr = 'SET ' + ', '.join(
+                ['#status = :status', 'updated_at = :now']
+                + [f'{key} = :{key}' for key in kwargs]
+            )
+            expr_attr_values = {
+                ':status': status,
+                ':now': now,
+                **{f':{key}': value for key, value in kwargs.items()}
+            }
             
             self.events_table.update_item(
                 Key={'event_tracking_id': event_tracking_id},
                 UpdateExpression=update_expr,
-                ExpressionAttributeNames=expr_attr_names,
+                ExpressionAttributeNames={'#status': 'status'},
                 ExpressionAttributeValues=expr_attr_values
             )
             return True
-        except Exception as e:
-            print(f"Error updating event status: {e}")
+        except Exception:
+            logger.exception("Error updating event status for %s", event_tracking_id)
             return False
     
     def add_reaction_to_event(
         self,
         event_tracking_id: str,
         user_id: str,
-        user_email: str,
         reaction: str
-    ) -> bool:
+    ) -> Optional[Dict]:
         """イベントにリアクションを追加
         
+        メールアドレスは保存せず、ミーティング作成時にuser_idから解決します。
+        ユーザーごとに最初のリアクションだけを記録し、ユニークユーザー数を
+        reaction_user_count としてサーバー側で数えます。
+        
         Args:
             event_tracking_id: イベントトラッキングID
             user_id: ユーザーID
-            user_email: ユーザーメールアドレス
             reaction: リアクション（絵文字）
             
         Returns:
-            bool: 成功したらTrue
+            Optional[Dict]: 更新後のイベントデータ（失敗時はNone）
+                既にリアクション済みのユーザーの場合は
+                event_tracking_id, status, reaction_user_count のみを含む
         """
+        now = _now_iso()
+        reaction_data = {
+            'user_id': user_id,
+            'reaction': reaction,
+            'timestamp': now
+        }
+        
         try:
-            now = datetime.utcnow().isoformat()
-            
-            reaction_data = {
-                'user_id': user_id,
-                'user_email': user_email,
-                'reaction': reaction,
-                'timestamp': now
-            }
-            
-            self.events_table.update_item(
+            # 未リアクションのユーザーの場合のみ追加し、カウンタを1増やす
+            # reaction_usersを持たない項目は、まだリアクションがない場合のみ対象にする
+            # ReturnValuesで更新後の項目を受け取り、再読み込みを不要にする
+            response = self.events_table.update_item(
                 Key={'event_tracking_id': event_tracking_id},
-                UpdateExpression='SET reactions = list_append(if_not_exists(reactions, :empty_list), :reaction)',
+                UpdateExpression='SET reactions = list_append(if_not_exists(reactions, :empty_list), :reaction), '
+                                'updated_at = :now '
+                                'ADD reaction_users :user, reaction_user_count :one',
+                ConditionExpression='(attribute_exists(reaction_users) AND NOT contains(reaction_users, :user_id)) '
+                                    'OR (attribute_not_exists(reaction_users) '
+                                    'AND (attribute_not_exists(reactions) OR size(reactions) = :zero))',
                 ExpressionAttributeValues={
                     ':reaction': [reaction_data],
-                    ':empty_list': []
-                }
+                    ':empty_list': [],
+                    ':now': now,
+                    ':user': {user_id},
+                    ':user_id': user_id,
+                    ':one': 1,
+                    ':zero': 0
+                },
+                ReturnValues='ALL_NEW'
+            )
+            return response.get('Attributes')
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                logger.exception("Error adding reaction to event %s", event_tracking_id)
+                return None
+        except Exception:
+            logger.exception("Error adding reaction to event %s", event_tracking_id)
+            return None
+        
+        # 既にリアクション済みのユーザー: カウンタとステータスだけを読む
+        try:
+            response = self.events_table.get_item(
+                Key={'event_tracking_id': event_tracking_id},
+                ProjectionExpression='event_tracking_id, reaction_user_count, #status',
+                ExpressionAttributeNames={'#status': 'status'}
+            )
+            item = response.get('Item')
+        except Exception:
+            logger.exception("Error getting reaction count for %s", event_tracking_id)
+            return None
+        
+        if not item or 'reaction_user_count' in item:
+            return item
+        
+        # カウンタ導入前にリアクションが付いたイベント: 既存のreactionsから初期化する
+        return self._backfill_reaction_users(event_tracking_id, reaction_data)
+    
+    def _backfill_reaction_users(self, event_tracking_id: str, reaction_data: Dict) -> Optional[Dict]:
+        """カウンタ導入前のイベントにreaction_users/reaction_user_countを設定
+        
+        既存のreactionsからユニークユーザーを数えて初期化し、
+        今回のユーザーが未リアクションならリアクションも追加します。
+        
+        Args:
+            event_tracking_id: イベントトラッキングID
+            reaction_data: 今回のリアクション
+            
+        Returns:
+            Optional[Dict]: 更新後のイベントデータ（失敗時はNone）
+        """
+        try:
+            response = self.events_table.get_item(
+                Key={'event_tracking_id': event_tracking_id},
+                ProjectionExpression='reactions'
+            )
+        except Exception:
+            logger.exception("Error getting reactions for %s", event_tracking_id)
+            return None
+        
+        reactions = response.get('Item', {}).get('reactions', [])
+        users = {r['user_id'] for r in reactions if r.get('user_id')}
+        is_new_user = reaction_data['user_id'] not in users
+        users.add(reaction_data['user_id'])
+        
+        update_expr = 'SET reaction_users = :users, reaction_user_count = :count, updated_at = :now'
+        expr_attr_values = {
+            ':users': users,
+            ':count': len(users),
+            ':now': reaction_data['timestamp']
+        }
+        if is_new_user:
+            update_expr += ', reactions = list_append(reactions, :reaction)'
+            expr_attr_values[':reaction'] = [reaction_data]
+        
+        try:
+            response = self.events_table.update_item(
+                Key={'event_tracking_id': event_tracking_id},
+                UpdateExpression=update_expr,
+                # 並行して初期化された場合は上書きしない
+                ConditionExpression='attribute_not_exists(reaction_users)',
+                ExpressionAttributeValues=expr_attr_values,
+                ReturnValues='ALL_NEW'
+            )
+            return response.get('Attributes')
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                # 他の呼び出しが先に初期化したので、通常の経路でやり直す
+                return self.add_reaction_to_event(
+                    event_tracking_id=event_tracking_id,
+                    user_id=reaction_data['user_id'],
+                    reaction=reaction_data['reaction']
+                )
+            logger.exception("Error backfilling reaction users for %s", event_tracking_id)
+            return None
+        except Exception:
+            logger.exception("Error backfilling reaction users for %s", event_tracking_id)
+            return None
+    
+    # === Transactions ===
+    
+    def _transact_put(self, puts: List[tuple]) -> bool:
+        """複数テーブルへのPutを1回のTransactWriteItemsで実行
+        
+        Args:
+            puts: (テーブル名, アイテム) のリスト
+            
+        Returns:
+            bool: 成功したらTrue
+        """
+        serializer = TypeSerializer()
+        try:
+            self.dynamodb.meta.client.transact_write_items(
+                TransactItems=[
+                    {
+                        'Put': {
+                            'TableName': table_name,
+                            'Item': {k: serializer.serialize(v) for k, v in item.items()}
+                        }
+                    }
+                    for table_name, item in puts
+                ]
             )
             return True
-        except Exception as e:
-            print(f"Error adding reaction to event: {e}")
+        except Exception:
+            logger.exception("Error in transact write")
             return False
     
+    def put_topic_and_event(self, topic: Dict, event: Dict) -> bool:
+        """話題とイベントをまとめて保存
+        
+        Args:
+            topic: 話題データ
+            event: イベントデータ
+            
+        Returns:
+            bool: 成功したらTrue
+        """
+        return self._transact_put([
+            (self.topics_table_name, topic),
+            (self.events_table_name, event)
+        ])
+    
+    def put_question_and_event(self, question: Dict, event: Dict) -> bool:
+        """質問とイベントをまとめて保存
+        
+        Args:
+            question: 質問データ
+            event: イベントデータ
+            
+        Returns:
+            bool: 成功したらTrue
+        """
+        return self._transact_put([
+            (self.questions_table_name, question),
+            (self.events_table_name, event)
+        ])
+    
     # === Questions Table ===
     
     def put_question(self, question: Dict) -> bool:
@@ -352,59 +648,176 @@ class DynamoDBClient:
         try:
             self.questions_table.put_item(Item=question)
             return True
-        except Exception as e:
-            print(f"Error putting question: {e}")
+        except Exception:
+            logger.exception("Error putting question")
             return False
     
+    def batch_put_questions(self, questions: List[Dict]) -> bool:
+        """質問をまとめて保存
+        
+        Args:
+            questions: 質問データのリスト
+            
+        Returns:
+            bool: 成功したらTrue
+        """
+        return self._batch_put(self.questions_table, questions, 'question_id', 'questions')
+    
     def get_recent_questions_for_user(
         self,
         user_id: str,
-        days: int = 7
+        days: int = 7,
+        attributes: Optional[List[str]] = None
     ) -> List[Dict]:
         """ユーザーへの最近の質問を取得
         
         Args:
             user_id: ユーザーID
             days: 何日以内の質問を取得するか
+            attributes: 取得する属性名のリスト（Noneなら全属性）
             
         Returns:
             List[Dict]: 質問リスト
         """
+        items: List[Dict] = []
         try:
-            from datetime import timedelta
-            cutoff_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
+            cutoff_date = (datetime.now(_UTC) - timedelta(days=days)).strftime(_ISO_FORMAT)
             
-            response = self.questions_table.query(
-                IndexName='UserTimeIndex',
-                KeyConditionExpression='user_id = :user AND asked_at > :cutoff',
-                ExpressionAttributeValues={
+            query_kwargs = {
+                'IndexName': 'UserTimeIndex',
+                'KeyConditionExpression': 'user_id = :user AND asked_at > :cutoff',
+                'ExpressionAttributeValues': {
                     ':user': user_id,
                     ':cutoff': cutoff_date
+                },
+                **_projection_kwargs(attributes)
+            }
+            while True:
+                response = self.questions_table.query(**query_kwargs)
+                items.extend(response.get('Items', []))
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    break
+                query_kwargs['ExclusiveStartKey'] = last_key
+            return items
+        except Exception:
+            logger.exception("Error getting recent questions")
+            return items
+    
+    def backfill_question_asked_dates(self) -> int:
+        """asked_dateを持たない既存の質問にasked_dateを補完
+        
+        DateIndex導入前に書き込まれた質問はインデックスに載らず、
+        get_question_counts_sinceで数えられないため、導入後に一度だけ実行します。
+        
+        Returns:
+            int: 補完した件数
+        """
+        updated = 0
+        try:
+            scan_kwargs = {
+                'FilterExpression': 'attribute_not_exists(asked_date)',
+                'ProjectionExpression': 'question_id, asked_at'
+            }
+            while True:
+                response = self.questions_table.scan(**scan_kwargs)
+                for item in response.get('Items', []):
+                    asked_at = item.get('asked_at')
+                    if not asked_at:
+                        continue
+                    self.questions_table.update_item(
+                        Key={'question_id': item['question_id']},
+                        UpdateExpression='SET asked_date = :date',
+                        ExpressionAttributeValues={':date': asked_at[:10]}
+                    )
+                    updated += 1
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    break
+                scan_kwargs['ExclusiveStartKey'] = last_key
+            return updated
+        except Exception:
+            logger.exception("Error backfilling question asked_date")
+            return updated
+    
+    def get_question_counts_since(self, days: int = 7) -> Optional[Dict[str, int]]:
+        """最近の質問回数をユーザーごとに集計
+        
+        DateIndex（asked_date）を日付パーティションごとにクエリし、
+        ユーザーごとの質問回数をまとめて取得します。
+        
+        Args:
+            days: 何日以内の質問を集計するか
+            
+        Returns:
+            Optional[Dict[str, int]]: {user_id: 質問回数}
+                クエリに失敗した場合はNone（途中までの集計は返さない）
+        """
+        now = datetime.now(_UTC)
+        cutoff = (now - timedelta(days=days)).strftime(_ISO_FORMAT)
+        counts: Dict[str, int] = {}
+        
+        try:
+            for offset in range(days + 1):
+                asked_date = (now - timedelta(days=offset)).strftime('%Y-%m-%d')
+                query_kwargs = {
+                    'IndexName': 'DateIndex',
+                    'KeyConditionExpression': 'asked_date = :date',
+                    'ExpressionAttributeValues': {':date': asked_date},
+                    'ProjectionExpression': 'user_id, asked_at'
                 }
-            )
-            return response.get('Items', [])
-        except Exception as e:
-            print(f"Error getting recent questions: {e}")
-            return []
+                while True:
+                    response = self.questions_table.query(**query_kwargs)
+                    for item in response.get('Items', []):
+                        if item.get('asked_at', '') > cutoff:
+                            counts[item['user_id']] = counts.get(item['user_id'], 0) + 1
+                    last_key = response.get('LastEvaluatedKey')
+                    if not last_key:
+                        break
+                    query_kwargs['ExclusiveStartKey'] = last_key
+            return counts
+        except Exception:
+            logger.exception("Error getting question counts")
+            return None
+
+
+def _convert_node(value, stack: list):
+    """1要素を変換（dict/listは空のコンテナを返し、中身の変換をstackに積む）
+    
+    dict/listのサブクラスも変換対象とし、変換後は通常のdict/listになります。
+    """
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, dict):
+        converted = {}
+        stack.append((value, converted))
+        return converted
+    if isinstance(value, list):
+        converted = []
+        stack.append((value, converted))
+        return converted
+    return value
 
 
 def decimal_to_python(obj):
     """DynamoDB DecimalをPython型に変換
     
+    再帰を使わずスタックで走査するため、深くネストした項目でも
+    再帰上限に達しません。
+    
     Args:
         obj: 変換対象のオブジェクト
         
     Returns:
         変換後のオブジェクト
     """
-    if isinstance(obj, list):
-        return [decimal_to_python(i) for i in obj]
-    elif isinstance(obj, dict):
-        return {k: decimal_to_python(v) for k, v in obj.items()}
-    elif isinstance(obj, Decimal):
-        if obj % 1 == 0:
-            return int(obj)
+    stack = []
+    result = _convert_node(obj, stack)
+    while stack:
+        source, target = stack.pop()
+        if isinstance(source, dict):
+            for key, value in source.items():
+                target[key] = _convert_node(value, stack)
         else:
-            return float(obj)
-    else:
-        return obj
+            target.extend([_convert_node(value, stack) for value in source])
+    return result
@@ -4,13 +4,84 @@ Data Models
 DynamoDBテーブルのデータモデルを定義します。
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional
-from dataclasses import dataclass, field, asdict
-import uuid
+from dataclasses import MISSING, dataclass, field, fields
+from decimal import Decimal
+from operator import attrgetter
+import os
+import time
 
 
-@dataclass
+# 直近に生成した時刻文字列（同一ミリ秒内の呼び出しでは使い回す）
+_last_now_iso = (0, '')
+
+
+def _now_iso() -> str:
+    """現在のUTC時刻をミリ秒精度のISO 8601文字列で取得"""
+    global _last_now_iso
+    ms = time.time_ns() // 1_000_000
+    if ms != _last_now_iso[0]:
+        dt = datetime.fromtimestamp(ms // 1000, timezone.utc).replace(microsecond=ms % 1000 * 1000)
+        _last_now_iso = (ms, dt.strftime('%Y-%m-%dT%H:%M:%S.%f'))
+    return _last_now_iso[1]
+
+
+def _generate_id() -> str:
+    """UUID v4形式のIDを生成
+    
+    uuid.UUIDオブジェクトを経由せず、乱数バイト列から直接文字列を組み立てる
+    """
+    b = bytearray(os.urandom(16))
+    b[6] = (b[6] & 0x0F) | 0x40  # バージョン4
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122バリアント
+    h = b.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _generate_from_dict(cls):
+    """dataclassごとに専用のfrom_dictを生成する
+    
+    cls(**data)のキーワード引数展開を避け、フィールド順の位置引数で__init__を呼ぶ
+    コードを生成します。未知のキー（DynamoDB側で追加された属性など）は無視します。
+    """
+    namespace = {'cls': cls}
+    args = []
+    for f in fields(cls):
+        if not f.init:
+            continue
+        if f.default is not MISSING:
+            namespace[f'_default_{f.name}'] = f.default
+            args.append(f"data.get({f.name!r}, _default_{f.name})")
+        elif f.default_factory is not MISSING:
+            namespace[f'_factory_{f.name}'] = f.default_factory
+            args.append(f"data[{f.name!r}] if {f.name!r} in data else _factory_{f.name}()")
+        else:
+            args.append(f"data[{f.name!r}]")
+    
+    source = f"def from_dict(cls, data):\n    return cls({', '.join(args)})\n"
+    exec(source, namespace)
+    from_dict = namespace['from_dict']
+    from_dict.__qualname__ = f'{cls.__qualname__}.from_dict'
+    from_dict.__doc__ = "辞書からインスタンスを生成"
+    cls.from_dict = classmethod(from_dict)
+    return cls
+
+
+def _cache_field_names(cls):
+    """dataclassのフィールド名と値の取得関数をクラス属性にキャッシュする
+    
+    to_dictのたびにfields()を辿ったりasdictでdeepcopyしたりしないためのもの。
+    _FIELD_VALUESはC実装のattrgetterで全フィールドの値をタプルで返します。
+    """
+    cls._FIELD_NAMES = tuple(f.name for f in fields(cls) if f.init)
+    cls._FIELD_VALUES = attrgetter(*cls._FIELD_NAMES)
+    return cls
+
+
+@_generate_from_dict
+@_cache_field_names
+@dataclass(slots=True)
 class Topic:
     """話題マスターデータ"""
     topic_id: str
@@ -20,30 +91,27 @@ class Topic:
     last_used_at: Optional[str] = None
     usage_count: int = 0
     total_reactions: int = 0
-    average_reactions: float = 0.0
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    average_reactions: Decimal = Decimal('0')  # DynamoDBのNumber型に合わせてDecimalで保持
+    created_at: str = field(default_factory=_now_iso)
     
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Topic':
-        """辞書からインスタンスを生成"""
-        return cls(**data)
+    def __post_init__(self):
+        """floatで渡された平均リアクション数を生成時に一度だけDecimalへ変換"""
+        if isinstance(self.average_reactions, float):
+            self.average_reactions = Decimal(str(self.average_reactions))
     
     def to_dict(self) -> dict:
         """辞書に変換（DynamoDB対応）"""
-        from decimal import Decimal
-        data = asdict(self)
-        # float型をDecimal型に変換
-        if 'average_reactions' in data and isinstance(data['average_reactions'], float):
-            data['average_reactions'] = Decimal(str(data['average_reactions']))
-        return data
+        return dict(zip(self._FIELD_NAMES, self._FIELD_VALUES(self)))
     
     @staticmethod
     def generate_id() -> str:
         """新しいIDを生成"""
-        return str(uuid.uuid4())
+        return _generate_id()
 
 
-@dataclass
+@_generate_from_dict
+@_cache_field_names
+@dataclass(slots=True)
 class Conversation:
     """会話履歴分析データ"""
     conversation_id: str
@@ -54,39 +122,42 @@ class Conversation:
     reaction_count: int
     sentiment: str  # 'positive', 'neutral', 'negative'
     is_used_for_topic: bool = False
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
-    
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Conversation':
-        """辞書からインスタンスを生成"""
-        return cls(**data)
+    created_at: str = field(default_factory=_now_iso)
     
     def to_dict(self) -> dict:
         """辞書に変換"""
-        return asdict(self)
+        return dict(zip(self._FIELD_NAMES, self._FIELD_VALUES(self)))
     
     @staticmethod
     def generate_id() -> str:
         """新しいIDを生成"""
-        return str(uuid.uuid4())
+        return _generate_id()
 
 
-@dataclass
+@_generate_from_dict
+@_cache_field_names
+@dataclass(slots=True, frozen=True)
 class Reaction:
-    """リアクション情報"""
+    """リアクション情報（不変・ハッシュ可能なので集合や辞書のキーに使える）"""
     user_id: str
     user_email: str
     reaction: str
-    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    timestamp: str = field(default_factory=_now_iso)
     
     def to_dict(self) -> dict:
         """辞書に変換"""
-        return asdict(self)
+        return dict(zip(self._FIELD_NAMES, self._FIELD_VALUES(self)))
 
 
-@dataclass
+@_generate_from_dict
+@_cache_field_names
+@dataclass(slots=True, eq=False)
 class EventTracking:
-    """イベントトラッキング"""
+    """イベントトラッキング
+    
+    リアクションはadd_reactionで追加すること（参加者集合を差分更新するため）
+    可変な状態を持つため、比較は値ではなく同一性で行う（eq=False）
+    """
     event_tracking_id: str
     slack_message_ts: str
     channel_id: str
@@ -95,47 +166,70 @@ class EventTracking:
     status: str  # 'collecting_reactions', 'scheduling', 'completed', 'cancelled'
     reactions: List[dict] = field(default_factory=list)
     calendar_event_id: Optional[str] = None
-    created_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
-    updated_at: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+    created_at: str = field(default_factory=_now_iso)
+    updated_at: str = field(default_factory=_now_iso)
+    # 参加者のユーザーID集合（add_reactionで差分更新する）
+    # 保存済みのreactionsはuser_emailを持たないため、user_idで数える
+    _participant_ids: set = field(init=False, repr=False, compare=False)
     
-    @classmethod
-    def from_dict(cls, data: dict) -> 'EventTracking':
-        """辞書からインスタンスを生成"""
-        return cls(**data)
+    def __post_init__(self):
+        """既存のリアクションから参加者集合を構築"""
+        self._participant_ids = {
+            user_id for user_id in (r.get('user_id') for r in self.reactions) if user_id
+        }
     
     def to_dict(self) -> dict:
-        """辞書に変換"""
-        return asdict(self)
+        """辞書に変換
+        
+        reactionsの各要素はスカラー値だけの辞書なので、リストの浅いコピーのみ行う
+        """
+        return {
+            'event_tracking_id': self.event_tracking_id,
+            'slack_message_ts': self.slack_message_ts,
+            'channel_id': self.channel_id,
+            'topic_id': self.topic_id,
+            'event_title': self.event_title,
+            'status': self.status,
+            'reactions': list(self.reactions),
+            'calendar_event_id': self.calendar_event_id,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at
+        }
     
     @staticmethod
     def generate_id() -> str:
         """新しいIDを生成"""
-        return str(uuid.uuid4())
+        return _generate_id()
     
     def add_reaction(self, user_id: str, user_email: str, reaction: str):
         """リアクションを追加"""
-        reaction_obj = Reaction(
-            user_id=user_id,
-            user_email=user_email,
-            reaction=reaction
-        )
-        self.reactions.append(reaction_obj.to_dict())
-        self.updated_at = datetime.utcnow().isoformat()
+        now = _now_iso()
+        # Reaction.to_dict()と同じ形式の辞書を直接組み立てる
+        self.reactions.append({
+            'user_id': user_id,
+            'user_email': user_email,
+            'reaction': reaction,
+            'timestamp': now
+        })
+        if user_id:
+            self._participant_ids.add(user_id)
+        self.updated_at = now
     
     def get_participant_emails(self) -> List[str]:
-        """参加者のメールアドレスリストを取得"""
-        emails = set()
-        for reaction in self.reactions:
-            if reaction.get('user_email'):
-                emails.add(reaction['user_email'])
-        return list(emails)
+        """参加者のメールアドレスリストを取得
+        
+        メールアドレスを持つリアクション（add_reactionで追加したもの）のみが対象
+        """
+        return list(dict.fromkeys(r['user_email'] for r in self.reactions if r.get('user_email')))
     
     def get_participant_count(self) -> int:
         """参加者数を取得"""
-        return len(self.get_participant_emails())
+        return len(self._participant_ids)
 
 
-@dataclass
+@_generate_from_dict
+@_cache_field_names
+@dataclass(slots=True)
 class Question:
     """メンバーへの質問履歴"""
     question_id: str
@@ -146,17 +240,18 @@ class Question:
     message_ts: str
     response_count: int = 0
     reaction_count: int = 0
+    asked_date: Optional[str] = None  # DateIndex用（YYYY-MM-DD）
     
-    @classmethod
-    def from_dict(cls, data: dict) -> 'Question':
-        """辞書からインスタンスを生成"""
-        return cls(**data)
+    def __post_init__(self):
+        """asked_atから日付パーティションを補完"""
+        if not self.asked_date:
+            self.asked_date = self.asked_at[:10]
     
     def to_dict(self) -> dict:
         """辞書に変換"""
-        return asdict(self)
+        return dict(zip(self._FIELD_NAMES, self._FIELD_VALUES(self)))
     
     @staticmethod
     def generate_id() -> str:
         """新しいIDを生成"""
-        return str(uuid.uuid4())
+        return _generate_id()
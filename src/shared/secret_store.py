@@ -0,0 +1,111 @@
+"""
+Secrets Manager Helper Module
+
+AWS Secrets Managerからのシークレット取得とキャッシュを提供します。
+複数のシークレットはbatch_get_secret_valueで1回のAPI呼び出しにまとめて取得できます。
+"""
+
+import os
+import json
+import logging
+import time
+import boto3
+from botocore.config import Config
+from typing import Dict, Iterable
+
+
+logger = logging.getLogger(__name__)
+
+# シークレットのキャッシュ（ウォームスタートのLambdaコンテナ内で共有）
+SECRET_CACHE_TTL = 600  # 10分
+_secret_cache: Dict[str, tuple] = {}  # {secret_id: (取得時刻, シークレット)}
+_secrets_client = None
+
+# スロットリングなどの一時的なエラーはbotocore側でリトライする
+_SECRETS_CLIENT_CONFIG = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 5},
+    connect_timeout=2,
+    read_timeout=3
+)
+
+
+def _get_secrets_client():
+    """Secrets Managerクライアントを取得（コンテナ内で使い回す）"""
+    global _secrets_client
+    if _secrets_client is None:
+        region = os.environ.get('AWS_REGION', 'ap-northeast-1')
+        _secrets_client = boto3.session.Session().client(
+            'secretsmanager',
+            region_name=region,
+            config=_SECRETS_CLIENT_CONFIG
+        )
+    return _secrets_client
+
+
+def _get_cached(secret_id: str):
+    """有効期限内のキャッシュ済みシークレットを取得（なければNone）"""
+    cached = _secret_cache.get(secret_id)
+    if cached and time.monotonic() - cached[0] < SECRET_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _match_requested_id(secret: Dict, requested_ids: Iterable[str]):
+    """batch_get_secret_valueの結果が、呼び出し側が指定したどのIDに対応するかを返す
+    
+    レスポンスのNameはシークレット名のため、ARN（末尾のランダム文字列を省いた
+    部分ARNを含む）で指定された場合も指定時のIDでキャッシュできるようにする。
+    """
+    name = secret.get('Name')
+    arn = secret.get('ARN', '')
+    for secret_id in requested_ids:
+        if secret_id == name or secret_id == arn or arn.startswith(f"{secret_id}-"):
+            return secret_id
+    return name
+
+
+def prefetch_secrets(secret_ids: Iterable[str]) -> None:
+    """複数のシークレットを1回のAPI呼び出しでまとめて取得してキャッシュ
+    
+    Lambdaの初期化時などに呼び出しておくと、後続のget_secretは
+    Secrets Managerへ問い合わせずにキャッシュから値を返します。
+    取得に失敗したシークレットはget_secretで個別に再取得されます。
+    
+    Args:
+        secret_ids: シークレット名またはARNのイテラブル
+    """
+    missing = [secret_id for secret_id in dict.fromkeys(secret_ids) if _get_cached(secret_id) is None]
+    if not missing:
+        return
+    
+    try:
+        response = _get_secrets_client().batch_get_secret_value(SecretIdList=missing)
+    except Exception:
+        logger.exception("Error prefetching secrets")
+        return
+    
+    # get_secretと同じキーで引けるよう、呼び出し側が指定したIDでキャッシュする
+    now = time.monotonic()
+    for secret in response.get('SecretValues', []):
+        secret_id = _match_requested_id(secret, missing)
+        _secret_cache[secret_id] = (now, json.loads(secret['SecretString']))
+    
+    for error in response.get('Errors', []):
+        logger.error("Error prefetching secret %s: %s", error.get('SecretId'), error.get('Message'))
+
+
+def get_secret(secret_id: str) -> Dict:
+    """シークレットを取得（キャッシュがあればそれを返す）
+    
+    Args:
+        secret_id: シークレット名またはARN
+    
+    Returns:
+        Dict: JSONとしてデコードしたシークレット
+    """
+    secret = _get_cached(secret_id)
+    if secret is None:
+        response = _get_secrets_client().get_secret_value(SecretId=secret_id)
+        secret = json.loads(response['SecretString'])
+        _secret_cache[secret_id] = (time.monotonic(), secret)
+    return secret
@@ -7,24 +7,60 @@ slack-boltライブラリを使用して、メッセージ投稿、リアクシ
 """
 
 import os
-import json
-import boto3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from slack_bolt import App
 from slack_sdk.errors import SlackApiError
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from . import secret_store
+
+
+# Slack認証情報のシークレット名
+SLACK_SECRET_NAME = os.environ.get('SLACK_SECRET_NAME', 'slack-bot/credentials')
+
+# ユーザー情報のキャッシュ（ウォームスタートのLambdaコンテナ内で共有）
+USER_INFO_CACHE_TTL = 1800  # 30分
+USERS_LIST_CACHE_TTL = 600  # 10分
+USERS_LIST_PREFETCH_THRESHOLD = 10  # キャッシュにないユーザーがこの人数以上ならusers.listでまとめて取得
+_user_info_cache: Dict[str, tuple] = {}  # {user_id: (取得時刻, ユーザー情報)}
+_users_list_cache: Optional[tuple] = None  # (取得時刻, ユーザーリスト)
+
+
+def _to_user_info(user: Dict) -> Dict:
+    """users.info / users.list のユーザーオブジェクトを共通の形式に変換"""
+    profile = user['profile']
+    return {
+        'id': user['id'],
+        'name': user.get('real_name', user['name']),
+        'email': profile.get('email', ''),
+        'display_name': profile.get('display_name', '')
+    }
 
 
 class SlackClient:
     """Slack APIクライアントのラッパークラス"""
     
-    def __init__(self):
-        """初期化: Secrets Managerから認証情報を取得"""
-        self.secrets = self._get_secrets()
-        self.app = App(
+    # 認証情報の取得とAppの構築は、Slack APIを初めて使うときまで遅延させる
+    
+    @cached_property
+    def secrets(self) -> Dict[str, str]:
+        """Slack認証情報"""
+        return self._get_secrets()
+    
+    @cached_property
+    def app(self) -> App:
+        """slack-boltのApp"""
+        return App(
             token=self.secrets['bot_token'],
             signing_secret=self.secrets['signing_secret']
         )
-        self.client = self.app.client
+    
+    @cached_property
+    def client(self):
+        """Slack WebClient"""
+        return self.app.client
     
     def _get_secrets(self) -> Dict[str, str]:
         """Secrets Managerから認証情報を取得
@@ -35,15 +71,8 @@ class SlackClient:
         Raises:
             Exception: Secrets Managerからの取得失敗時
         """
-        secret_name = os.environ.get('SLACK_SECRET_NAME', 'slack-bot/credentials')
-        region = os.environ.get('AWS_REGION', 'ap-northeast-1')
-        
-        session = boto3.session.Session()
-        client = session.client('secretsmanager', region_name=region)
-        
         try:
-            response = client.get_secret_value(SecretId=secret_name)
-            return json.loads(response['SecretString'])
+            return secret_store.get_secret(SLACK_SECRET_NAME)
         except Exception as e:
             raise Exception(f"Failed to get Slack secrets: {str(e)}")
     
@@ -105,19 +134,39 @@ class SlackClient:
                 timestamp=timestamp
             )
             
-            reactions = []
-            if 'message' in response and 'reactions' in response['message']:
-                for reaction in response['message']['reactions']:
-                    for user in reaction['users']:
-                        reactions.append({
-                            'user_id': user,
-                            'reaction': reaction['name']
-                        })
-            
-            return reactions
+            reactions = response.get('message', {}).get('reactions', ())
+            return [
+                {'user_id': user, 'reaction': reaction['name']}
+                for reaction in reactions
+                for user in reaction['users']
+            ]
         except SlackApiError as e:
             raise Exception(f"Failed to get reactions: {e.response['error']}")
     
+    def get_reactions_with_users(self, channel: str, timestamp: str) -> List[Dict]:
+        """メッセージのリアクションをユーザーのメールアドレス付きで取得
+        
+        リアクションしたユーザーの情報はget_users_info_batchで並列に取得します。
+        
+        Args:
+            channel: チャンネルID
+            timestamp: メッセージタイムスタンプ
+        
+        Returns:
+            List[Dict]: リアクション情報のリスト
+                [{'user_id': 'U123', 'reaction': 'thumbsup', 'user_email': 'user@example.com'}, ...]
+                ユーザー情報を取得できなかった場合、user_emailはNone
+                
+        Raises:
+            Exception: リアクション取得失敗時
+        """
+        reactions = self.get_reactions(channel, timestamp)
+        users = self.get_users_info_batch(r['user_id'] for r in reactions)
+        for reaction in reactions:
+            user = users.get(reaction['user_id'])
+            reaction['user_email'] = user['email'] if user else None
+        return reactions
+    
     def get_user_info(self, user_id: str) -> Dict:
         """ユーザー情報を取得
         
@@ -130,18 +179,63 @@ class SlackClient:
         Raises:
             Exception: ユーザー情報取得失敗時
         """
+        cached = _user_info_cache.get(user_id)
+        if cached and time.time() - cached[0] < USER_INFO_CACHE_TTL:
+            return cached[1]
+        
         try:
             response = self.client.users_info(user=user_id)
-            user = response['user']
-            return {
-                'id': user['id'],
-                'name': user.get('real_name', user['name']),
-                'email': user['profile'].get('email', ''),
-                'display_name': user['profile'].get('display_name', '')
-            }
+            user_info = _to_user_info(response['user'])
+            _user_info_cache[user_id] = (time.time(), user_info)
+            return user_info
         except SlackApiError as e:
             raise Exception(f"Failed to get user info: {e.response['error']}")
     
+    def get_users_info_batch(self, user_ids: Iterable[str], max_workers: int = 8) -> Dict[str, Dict]:
+        """複数ユーザーの情報をまとめて取得
+        
+        キャッシュにないユーザーのみ users.info を並列に呼び出します。
+        未キャッシュのユーザーが多い場合は先に users.list でまとめて取得します。
+        
+        Args:
+            user_ids: ユーザーIDのリスト
+            max_workers: 並列数
+        
+        Returns:
+            Dict[str, Dict]: {user_id: ユーザー情報}
+                取得に失敗したユーザーは含まれない
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return {}
+        
+        # 未キャッシュのユーザーが多い場合はusers.list 1回でキャッシュを埋める
+        now = time.time()
+        missing = [
+            user_id for user_id in user_ids
+            if user_id not in _user_info_cache or now - _user_info_cache[user_id][0] >= USER_INFO_CACHE_TTL
+        ]
+        if len(missing) >= USERS_LIST_PREFETCH_THRESHOLD:
+            try:
+                self.list_users()
+            except Exception as e:
+                print(f"Error prefetching users: {e}")
+        
+        def fetch(user_id):
+            # 1人の失敗で全体を中断せず、そのユーザーだけを除外する
+            try:
+                return self.get_user_info(user_id)
+            except Exception as e:
+                print(f"Error getting user info for {user_id}: {e}")
+                return None
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(user_ids))) as executor:
+            return {
+                user_id: user_info
+                for user_id, user_info in zip(user_ids, executor.map(fetch, user_ids))
+                if user_info is not None
+            }
+    
     def get_channel_history(
         self,
         channel: str,
@@ -175,6 +269,92 @@ class SlackClient:
         except SlackApiError as e:
             raise Exception(f"Failed to get channel history: {e.response['error']}")
     
+    def iter_channel_history(
+        self,
+        channel: str,
+        oldest: Optional[str] = None,
+        page_size: int = 200
+    ) -> Iterator[Dict]:
+        """チャンネル履歴をページ単位で順に取得
+        
+        全件をメモリに載せずに、カーソルでページングしながら
+        メッセージを1件ずつ返します。
+        
+        Args:
+            channel: チャンネルID
+            oldest: この時刻（Unix timestamp）以降のメッセージを取得
+            page_size: 1回のAPI呼び出しで取得する件数（最大1000）
+        
+        Yields:
+            Dict: メッセージ
+            
+        Raises:
+            Exception: チャンネル履歴取得失敗時
+        """
+        kwargs = {
+            'channel': channel,
+            'limit': min(page_size, 1000)  # API制限
+        }
+        
+        if oldest:
+            kwargs['oldest'] = oldest
+        
+        while True:
+            try:
+                response = self.client.conversations_history(**kwargs)
+            except SlackApiError as e:
+                raise Exception(f"Failed to get channel history: {e.response['error']}")
+            
+            yield from response['messages']
+            
+            cursor = response.get('response_metadata', {}).get('next_cursor')
+            if not response.get('has_more') or not cursor:
+                return
+            kwargs['cursor'] = cursor
+    
+    def iter_users(self, page_size: int = 200) -> Iterator[Dict]:
+        """ワークスペース内の全ユーザーを順に取得（ページネーション対応）
+        
+        users.list をカーソルで辿り、1ページずつ処理します。
+        bot、削除済みユーザーは除外されます。
+        
+        Args:
+            page_size: 1回のAPI呼び出しで取得する件数
+        
+        Yields:
+            Dict: ユーザー情報（id, name, email）
+            
+        Raises:
+            Exception: ユーザーリスト取得失敗時
+        """
+        cursor = None
+        while True:
+            try:
+                kwargs = {'limit': page_size}
+                if cursor:
+                    kwargs['cursor'] = cursor
+                response = self.client.users_list(**kwargs)
+            except SlackApiError as e:
+                raise Exception(f"Failed to list users: {e.response['error']}")
+            
+            now = time.time()
+            for user in response['members']:
+                user_info = _to_user_info(user)
+                # get_user_info用のキャッシュもまとめて更新
+                _user_info_cache[user['id']] = (now, user_info)
+                
+                # botやdeleted userを除外
+                if not user.get('is_bot') and not user.get('deleted'):
+                    yield {
+                        'id': user_info['id'],
+                        'name': user_info['name'],
+                        'email': user_info['email']
+                    }
+            
+            cursor = (response.get('response_metadata') or {}).get('next_cursor')
+            if not cursor:
+                return
+    
     def list_users(self) -> List[Dict]:
         """ワークスペース内の全ユーザーを取得
         
@@ -186,20 +366,13 @@ class SlackClient:
         Raises:
             Exception: ユーザーリスト取得失敗時
         """
-        try:
-            response = self.client.users_list()
-            users = []
-            for user in response['members']:
-                # botやdeleted userを除外
-                if not user.get('is_bot') and not user.get('deleted'):
-                    users.append({
-                        'id': user['id'],
-                        'name': user.get('real_name', user['name']),
-                        'email': user['profile'].get('email', '')
-                    })
-            return users
-        except SlackApiError as e:
-            raise Exception(f"Failed to list users: {e.response['error']}")
+        global _users_list_cache
+        if _users_list_cache and time.time() - _users_list_cache[0] < USERS_LIST_CACHE_TTL:
+            return _users_list_cache[1]
+        
+        users = list(self.iter_users())
+        _users_list_cache = (time.time(), users)
+        return users
     
     def add_reaction(self, channel: str, timestamp: str, emoji: str) -> None:
         """メッセージにリアクションを追加
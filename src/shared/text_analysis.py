@@ -0,0 +1,84 @@
+"""
+Text Analysis Module
+
+会話テキストのキーワード抽出と簡易感情分析を提供します。
+正規表現はモジュール読み込み時に一度だけコンパイルされるため、
+ウォームスタートのLambdaではコンパイル済みのパターンがそのまま再利用されます。
+"""
+
+import re
+import sys
+
+
+# キーワード抽出用の正規表現（呼び出しごとのコンパイルを避ける）
+# 技術用語パターンは1つの選択パターンにまとめて1回の走査で抽出する
+_TECH_RE = re.compile(
+    r'\b[A-Z][a-z]+(?:[A-Z][a-z]+)+\b'  # CamelCase (e.g., JavaScript, TypeScript)
+    r'|\b[A-Z]{2,}\b'  # 大文字略語 (e.g., API, AWS, CI/CD)
+    r'|\w+(?:\.js|\.py|\.go|\.rb)\b'  # ファイル拡張子付き
+)
+_JP_RE = re.compile(r'[ぁ-んァ-ヶー一-龠]+')
+_EN_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+# 感情分析用キーワード
+POSITIVE_KEYWORDS = ('良い', '素晴らしい', '最高', 'いいね', '面白い', 'すごい', 'ありがとう', '成功', '解決')
+NEGATIVE_KEYWORDS = ('悪い', '問題', 'エラー', 'バグ', '失敗', '困った', '難しい')
+
+# 英字など大小文字のあるキーワードが含まれる場合のみ大小文字を無視して照合する
+# （日本語のみの間は text.lower() によるコピーは不要）
+_HAS_CASED_KEYWORDS = any(kw.lower() != kw.upper() for kw in POSITIVE_KEYWORDS + NEGATIVE_KEYWORDS)
+
+
+def extract_keywords(text: str, min_length: int = 2) -> list:
+    """テキストからキーワードを抽出
+    
+    Args:
+        text: テキスト
+        min_length: 最小文字数
+        
+    Returns:
+        list: キーワードリスト
+    """
+    # 技術用語を抽出
+    keywords = set(_TECH_RE.findall(text))
+    
+    # 日本語のキーワード抽出（簡易版）
+    # TODO: 形態素解析ライブラリ（MeCab等）を使用して精度向上
+    keywords.update(w for w in _JP_RE.findall(text) if len(w) >= min_length)
+    
+    # 英単語の抽出
+    keywords.update(_EN_RE.findall(text))
+    
+    # 同じキーワードはメッセージ間で繰り返し現れるため、文字列を共有させる
+    return [sys.intern(k) for k in keywords]
+
+
+def analyze_sentiment(text: str, reaction_count: int) -> str:
+    """感情分析（簡易版）
+    
+    Args:
+        text: テキスト
+        reaction_count: リアクション数
+        
+    Returns:
+        str: 'positive', 'neutral', 'negative'
+    """
+    # キーワードごとに部分一致で判定する（文字を共有するキーワードも個別に数える）
+    if _HAS_CASED_KEYWORDS:
+        text = text.lower()
+    
+    positive_count = sum(1 for kw in POSITIVE_KEYWORDS if kw in text)
+    negative_count = sum(1 for kw in NEGATIVE_KEYWORDS if kw in text)
+    
+    # リアクション数も考慮
+    if reaction_count >= 5:
+        positive_count += 2
+    elif reaction_count >= 3:
+        positive_count += 1
+    
+    if positive_count > negative_count:
+        return 'positive'
+    elif negative_count > positive_count:
+        return 'negative'
+    else:
+        return 'neutral'